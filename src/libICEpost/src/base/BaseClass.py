@@ -11,7 +11,9 @@ Last update:        12/06/2023
 #                               IMPORT                              #
 #####################################################################
 
-import copy as cp
+from types import MappingProxyType
+from functools import cache
+from typing import Callable
 
 from .Utilities import Utilities
 
@@ -28,9 +30,11 @@ except ImportError:
 #############################################################################
 def _add_TypeName(cls:type):
     """
-    Function used to add the TypeName a class.
+    Function used to add the TypeName a class. The class is modified only if 
+    not already set, to avoid invalidating the type caches.
     """
-    cls.TypeName = cls.__name__
+    if cls.__dict__.get("TypeName") != cls.__name__:
+        cls.TypeName = cls.__name__
 
 #############################################################################
 #                               MAIN CLASSES                                #
@@ -39,10 +43,13 @@ def _add_TypeName(cls:type):
 class SelectionTable(Utilities):
     """
     Table for storing classes for run-time selection.
+    
+    Argument checking is skipped when running python with optimizations (-O).
     """
     
     __type:type
     __db:dict[str:type]
+    __abstract:dict[str:bool]
     
     @property
     def type(self) -> type:
@@ -52,12 +59,12 @@ class SelectionTable(Utilities):
         return self.__type
     
     @property
-    def db(self) -> dict[str:type]:
+    def db(self) -> MappingProxyType[str:type]:
         """
         Database of available sub-classes in the selection table.
-        Classes are stored through [str->type] map.
+        Classes are stored through [str->type] map (read-only view).
         """
-        return self.__db
+        return MappingProxyType(self.__db)
     
     ##########################################################################################
     def __init__(self, cls:type):
@@ -68,6 +75,7 @@ class SelectionTable(Utilities):
 
         self.__type = cls
         self.__db = {cls.__name__:cls}
+        self.__abstract = {cls.__name__:inspect.isabstract(cls)}
 
         _add_TypeName(cls)
     
@@ -76,21 +84,13 @@ class SelectionTable(Utilities):
         """
         Printing selection table
         """
-        string = f"Run-time selection table for class {self.type.__name__}:"
-        for className, classType in [(CLSNM, self[CLSNM]) for CLSNM in self.__db]:
-            string += "\n\t{:40s}{:s}".format(className, "(Abstract class)" if inspect.isabstract(classType) else "")
-        
-        return string
+        return "\n\t".join([f"Run-time selection table for class {self.type.__name__}:"] + ["{:40s}{:s}".format(className, "(Abstract class)" if isAbstract else "") for className, isAbstract in self.__abstract.items()])
     
     def __repr__(self):
         """
         Representation of selection table
         """
-        string = f"SelectionTable({self.type.__name__})["
-        for className in self.__db:
-            string += f" {className}"
-        
-        return string + " ]"
+        return f"SelectionTable({self.type.__name__})[ " + " ".join(self.__db) + " ]"
     
     ##########################################################################################
     def __contains__(self, typeName:str) -> bool:
@@ -108,17 +108,26 @@ class SelectionTable(Utilities):
         """
         Get from database
         """
-        try:
+        if __debug__:
             self.checkType(typeName, str, "typeName")
-            if not typeName in self:
-                string = f"Class {typeName} not found in selection table. Available classes are:"
-                for entry in self.__db:
-                    string += f"\n{entry}"
-                raise ValueError(string)
-        except BaseException as err:
-            self.fatalErrorInClass(self.__getitem__, f"Argument checking failed", err)
         
-        return self.__db[typeName]
+        classType = self.__db.get(typeName)
+        if classType is None:
+            self.fatalErrorInClass(self.__getitem__, "Argument checking failed", ValueError("\n".join([f"Class {typeName} not found in selection table. Available classes are:", *self.__db])))
+        
+        return classType
+    
+    ##########################################################################################
+    def get(self, typeName:str, default:type=None) -> type:
+        """
+        typeName: str
+            Name of the class to look-up
+        default: type (None)
+            Value returned if not found
+
+        Get the class called 'typeName' from the selection table, or 'default' if not found.
+        """
+        return self.__db.get(typeName, default)
     
     ##########################################################################################
     def add(self, cls:type, overwrite=True) -> None:
@@ -135,10 +144,34 @@ class SelectionTable(Utilities):
         
         if issubclass(cls, self.type):
             self.__db[typeName] = cls
+            self.__abstract[typeName] = inspect.isabstract(cls)
             _add_TypeName(cls)
         else:
             self.fatalErrorInClass(self.add,f"Class '{cls.__name__}' is not derived from '{self.type.__name__}'; cannot add '{typeName}' to runtime selection table.")
             
+    ##########################################################################################
+    def isAbstract(self, typeName:str) -> bool:
+        """
+        typeName: str
+            Name of the class to look-up
+
+        Check if the class called 'typeName' in the selection table is abstract (cached when added).
+        """
+        return self.__abstract[typeName]
+    
+    ##########################################################################################
+    def checkInstantiable(self, typeName:str) -> bool:
+        """
+        typeName: str
+            Name of class to be checked
+
+        Checks if a class in the selection table can be instantiated, raises TypeError if abstract
+        """
+        if self.__abstract[typeName]:
+            target = self.__db[typeName]
+            raise TypeError(f"Can't instantiate abstract class {target.__name__} with abstract methods: " + ", ".join(target.__abstractmethods__) + ".")
+        return True
+    
     ##########################################################################################
     def check(self, typeName:str) -> bool:
         """
@@ -148,29 +181,39 @@ class SelectionTable(Utilities):
         Checks if a class name is in the selection table, raises ValueError if false
         """
 
-        if not typeName in self:
-            string = f"No class '{typeName}' found in selection table for class {self.__type.__name__}. Available classes are:"
-            for className, classType in [(CLSNM, self[CLSNM]) for CLSNM in self.__db]:
-                string += "\n\t{:40s}{:s}".format(className, "(Abstract class)" if inspect.isabstract(classType) else "")
-            
-            raise ValueError(string)
-        return True
+        if typeName in self.__db:
+            return True
+        raise ValueError(self._missingClassMessage(typeName))
+    
+    def _missingClassMessage(self, typeName:str) -> str:
+        """
+        Error message for a class not found in the selection table (only built on failure).
+        """
+        return "\n\t".join([f"No class '{typeName}' found in selection table for class {self.__type.__name__}. Available classes are:"] + ["{:40s}{:s}".format(className, "(Abstract class)" if isAbstract else "") for className, isAbstract in self.__abstract.items()])
 
 ##########################################################################################
 #Base class
 class BaseClass(Utilities, metaclass=ABCMeta):
     """
     Class wrapping useful methods for base virtual classes (e.g. run-time selector)
+    
+    Argument checking in the run-time selection methods is skipped when running 
+    python with optimizations (-O), as it is guarded by __debug__.
     """
+    
+    _selectionTable:SelectionTable
+    """The run-time selection table, owned by the class that created it (looked-up in the class __dict__)."""
+    
     ##########################################################################################
     @classmethod
     def selectionTable(cls) -> SelectionTable:
         """
         The run-time selection table associated to this class.
         """
-        if not cls.hasSelectionTable():
+        table = cls.__dict__.get("_selectionTable")
+        if table is None:
             cls.fatalErrorInClass(cls.selectionTable,f"No run-time selection available for class {cls.__name__}.")
-        return getattr(cls,f"_{cls.__name__}__selectionTable")
+        return table
 
     ##########################################################################################
     @classmethod
@@ -184,34 +227,69 @@ class BaseClass(Utilities, metaclass=ABCMeta):
         
         Construct an instance of a subclass of this that was added to the selection table.
         """
-        try:
-            cls.checkType(dictionary, dict, "dictionary")
-            cls.checkType(typeName, str, "typeName")
-        except BaseException as err:
-            cls.fatalErrorInClass(cls.selector, f"Argument checking failed", err)
+        if __debug__:
+            if not isinstance(dictionary, dict):
+                cls.fatalErrorInClass(cls.selector, "Argument checking failed", TypeError(f"Wrong type for entry 'dictionary': 'dict' expected but '{dictionary.__class__.__name__}' was found."))
+            if not isinstance(typeName, str):
+                cls.fatalErrorInClass(cls.selector, "Argument checking failed", TypeError(f"Wrong type for entry 'typeName': 'str' expected but '{typeName.__class__.__name__}' was found."))
         
         try:
             #Check if has table
-            if not cls.hasSelectionTable():
+            table = cls.__dict__.get("_selectionTable")
+            if table is None:
                 raise ValueError(f"No run-time selection table available for class {cls.__name__}")
             
             #Check if class in table
-            cls.selectionTable().check(typeName)
+            target = table.get(typeName)
+            if target is None:
+                table.check(typeName)
+            
+            #Check if abstract
+            table.checkInstantiable(typeName)
             
             #Try instantiation
-            instance = cls.selectionTable()[typeName].fromDictionary(dictionary)
-        except BaseException as err:
-            cls.fatalErrorInClass(cls.selector, f"Failed constructing instance of type '{cls.selectionTable()[typeName].__name__}'", err)
+            instance = target.fromDictionary(dictionary)
+        except Exception as err:
+            cls.fatalErrorInClass(cls.selector, f"Failed constructing instance of type '{typeName}'", err)
         
         return instance
     
+    ##########################################################################################
+    @classmethod
+    @cache
+    def fastSelector(cls) -> Callable[[str,dict],Self]:
+        """
+        Get a function with the same signature of 'selector', bound to the run-time selection 
+        table of this class, without argument checking. To be used when constructing many 
+        instances in loops. The function is cached for each class.
+        
+        E.g.:
+        
+            sel = ClassA.fastSelector()
+            instance = sel("ClassB", dictionary)
+        """
+        table = cls.selectionTable()
+        lookup = table.db.get
+        isAbstract = table.isAbstract
+        
+        def selector(typeName:str, dictionary:dict) -> Self:
+            target = lookup(typeName)
+            if target is None:
+                table.check(typeName)
+            if isAbstract(typeName):
+                table.checkInstantiable(typeName)
+            return target.fromDictionary(dictionary)
+        
+        return selector
+    
     ##########################################################################################
     @classmethod
     def hasSelectionTable(cls) -> bool:
         """
-        Check if selection table was defined for this class.
+        Check if selection table was defined for this class. Only the class
+        that created the table owns it: tables of base classes are not inherited.
         """
-        return hasattr(cls, f"_{cls.__name__}__selectionTable")
+        return "_selectionTable" in cls.__dict__
     
     ##########################################################################################
     @classmethod
@@ -223,13 +301,6 @@ class BaseClass(Utilities, metaclass=ABCMeta):
         
         Construct an instance of this class from a dictionary. To be overwritten by derived class.
         """
-        try:
-            cls.checkType(dictionary, dict, "dictionary")
-        except BaseException as err:
-            cls.fatalErrorInClass(cls.fromDictionary, f"Argument checking failed", err)
-        
-        if inspect.isabstract(cls):
-            cls.fatalErrorInClass(cls.fromDictionary, f"Can't instantiate abstract class {cls.__name__} with abstract methods: " + ", ".join(am for am in cls.__abstractmethods__) + ".")
     
     ##########################################################################################
     @classmethod
@@ -245,7 +316,7 @@ class BaseClass(Utilities, metaclass=ABCMeta):
         if not cls.hasSelectionTable():
             cls.fatalErrorInClass(cls.addToRuntimeSelectionTable,f"No run-time selection available for class {cls.__name__}.")
         
-        cls.selectionTable().add(childClass, overwrite=True)
+        cls._selectionTable.add(childClass, overwrite=overwrite)
 
     ##########################################################################################
     @classmethod
@@ -257,7 +328,7 @@ class BaseClass(Utilities, metaclass=ABCMeta):
         if cls.hasSelectionTable():
             cls.fatalErrorInClass(cls.createRuntimeSelectionTable,f"A selection table is already present for class {cls.__name__}, cannot generate a new selection table.")
         
-        setattr(cls,f"_{cls.__name__}__selectionTable",SelectionTable(cls))
+        cls._selectionTable = SelectionTable(cls)
     
     ##########################################################################################
     @classmethod
@@ -272,4 +343,4 @@ class BaseClass(Utilities, metaclass=ABCMeta):
             ClassB     
             ClassC
         """
-        print(cls.selectionT)
\ No newline at end of file
+        print(cls.selectionTable())
\ No newline at end of file
@@ -14,6 +14,9 @@ Last update:        DD/MM/YYYY
 #Import BaseClass class (interface for base classes)
 from libICEpost.src.base.BaseClass import BaseClass, abstractmethod
 
+#Other imports
+import numpy as np
+
 #############################################################################
 #                               MAIN CLASSES                                #
 #############################################################################
@@ -49,6 +52,63 @@ class Filter(BaseClass):
     
     #########################################################################
     #Methods:
+    def batch(self, x:"list[float]", Y:"np.ndarray") -> "tuple[np.ndarray,np.ndarray]":
+        """
+        Filter multiple data-sets sampled at the same x points. By default, 
+        the filter is applied to each column of Y. Derived classes can 
+        override it to process all columns at once.
+        
+        Raises:
+            ValueError: If the data-sets are filtered to different x sampling points.
+
+        Args:
+            x (list[float]): The x sampling points
+            Y (np.ndarray): The data-sets stored by columns (shape [len(x), nCols])
+
+        Returns:
+            tuple[np.ndarray,np.ndarray]: The new x sampling points and the filtered data-sets (by columns)
+        """
+        Y = np.asarray(Y)
+        out = [self(x, Y[:,ii]) for ii in range(Y.shape[1])]
+        
+        #Check that all data-sets were filtered to the same x sampling points
+        xOut = np.asarray(out[0][0])
+        if not all(np.array_equal(o[0], xOut) for o in out):
+            raise ValueError(f"Filter {self.__class__.__name__} returned different x sampling points for the data-sets, cannot be applied in batch.")
+        
+        return xOut, np.column_stack([o[1] for o in out])
+    
+    ################################
+    @staticmethod
+    def _interp(x:"list[float]", xp:"list[float]", Fp:"np.ndarray") -> "np.ndarray":
+        """
+        Linear interpolation of each column of Fp (equivalent to np.interp 
+        applied by columns, with nan outside of the range of xp). The search 
+        of the intervals is performed only once for all columns.
+
+        Args:
+            x (list[float]): The points where to interpolate
+            xp (list[float]): The sampling points (increasing)
+            Fp (np.ndarray): The data-sets stored by columns (shape [len(xp), nCols])
+
+        Returns:
+            np.ndarray: The interpolated data-sets (shape [len(x), nCols])
+        """
+        x = np.asarray(x, dtype=float)
+        xp = np.asarray(xp, dtype=float)
+        Fp = np.asarray(Fp, dtype=float)
+        
+        #Intervals
+        j = np.clip(np.searchsorted(xp, x, side="right") - 1, 0, len(xp) - 2)
+        slope = (Fp[j+1] - Fp[j])/(xp[j+1] - xp[j])[:,np.newaxis]
+        out = slope*(x - xp[j])[:,np.newaxis] + Fp[j]
+        
+        #Same handling of constant intervals and end-point as np.interp
+        out = np.where(Fp[j+1] == Fp[j], Fp[j], out)
+        out[x == xp[-1]] = Fp[-1]
+        out[(x < xp[0]) | (x > xp[-1]) | np.isnan(x)] = float("nan")
+        
+        return out
     
 #########################################################################
 #Create selection table for the class used for run-time selection of type
@@ -137,6 +137,24 @@ class LowPass(Filter):
     
     #########################################################################
     #Methods:
+    def batch(self, xp:"list[float]", Yp:"np.ndarray") -> "tuple[np.ndarray,np.ndarray]":
+        """
+        Filter multiple data-sets sampled at the same x points with low-pass filter
+        """
+        #Resample on uniform grid with step equal to the minimum step
+        xp = np.asarray(xp, dtype=float)
+        delta = min(np.diff(xp))
+        res_x = np.arange(xp[0],xp[-1], delta)
+        res_Y = self._interp(res_x, xp, Yp)
+        
+        #Apply filter (along columns)
+        b, a = self._butter_lowpass(self.cutoff, 1./delta, order=self.order)
+        filt_Y = filtfilt(b, a, res_Y, axis=0)
+        filt_x = np.linspace(xp[0],xp[len(xp)-1], len(filt_Y))
+        
+        return filt_x, filt_Y
+    
+    ###################################
     def _butter_lowpass(self, cutoff:float, fs:float, order:int=5):
         nyq = 0.5 * fs
         normal_cutoff = cutoff / nyq
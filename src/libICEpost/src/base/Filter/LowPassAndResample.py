@@ -81,6 +81,14 @@ class LowPassAndResample(LowPass, Resample):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(delta:{self.delta}, cutoff:{self.cutoff}, order:{self.order})"
     
+    #########################################################################
+    #Methods:
+    def batch(self, xp:"list[float]", Yp:"np.ndarray") -> "tuple[np.ndarray,np.ndarray]":
+        """
+        Filter multiple data-sets sampled at the same x points with low-pass filter and resampling
+        """
+        return Resample.batch(self, *LowPass.batch(self, xp, Yp))
+    
 #########################################################################
 #Add to selection table of Base
 Filter.addToRuntimeSelectionTable(LowPassAndResample)
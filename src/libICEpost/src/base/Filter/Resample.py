@@ -110,6 +110,12 @@ class Resample(Filter):
     
     #########################################################################
     #Methods:
+    def batch(self, xp:"list[float]", Yp:"np.ndarray") -> "tuple[np.ndarray,np.ndarray]":
+        """
+        Resample multiple data-sets sampled at the same x points with constant spacing
+        """
+        interval = np.arange(xp[0],xp[len(xp)-1]+self.delta, self.delta)
+        return interval, self._interp(interval, xp, Yp)
 
 #########################################################################
 #Add to selection table of Base
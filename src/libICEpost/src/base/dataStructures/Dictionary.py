@@ -13,21 +13,27 @@ Last update:        12/06/2023
 
 
 from ..Utilities import Utilities
-from collections import OrderedDict
 
-from types import ModuleType
+from types import ModuleType, CodeType
+from itertools import islice
 from typing import TypeVar, Iterable, Any, _SpecialGenericAlias
 T = TypeVar("T")
 
+import builtins
+import os
 import os.path as path
 
+#Cache of compiled dictionary files, indexed by (absolute path, size, modification time)
+_CODE_CACHE:dict[tuple[str,int,int],CodeType] = {}
+
 #############################################################################
 #                               MAIN CLASSES                                #
 #############################################################################
 
-class Dictionary(OrderedDict, Utilities):
+class Dictionary(dict, Utilities):
     """
     Ordered dictionary embedding some useful OpenFOAM-like methods.
+    (Built on dict, which preserves insertion order since python 3.7)
     """
     path:str|None
     file:str|None
@@ -35,7 +41,7 @@ class Dictionary(OrderedDict, Utilities):
     #############################################################################
     def __init__(self, *args, _fileName:str=None, **argv):
         """
-        Same constructor as collections.OrderedDict class.
+        Same constructor as dict class.
         """
         try:
             if _fileName is None:
@@ -57,7 +63,9 @@ class Dictionary(OrderedDict, Utilities):
                     raise ValueError(f"Invalid file name {_fileName}")
                 self.fileName = file
             
+            #NOTE: dict.__init__ does not go through __setitem__
             super().__init__(*args,**argv)
+            self._correctSubdicts()
                 
         except BaseException as err:
             self.fatalErrorInClass(self.__init__,f"Construction of {self.__class__.__name__} entry failed", err)
@@ -80,16 +88,25 @@ class Dictionary(OrderedDict, Utilities):
         try:
             this = cls(_fileName=fileName)
             
-            _LOCALS = locals().copy()
-            _OLDLOCALS = list(_LOCALS)
+            #Compile the file only if not already cached (or if modified)
+            stat = os.stat(fileName)
+            key = (path.abspath(fileName), stat.st_size, stat.st_mtime_ns)
+            code = _CODE_CACHE.get(key)
+            if code is None:
+                with open(fileName) as file:
+                    code = compile(file.read(), fileName, "exec")
+                _CODE_CACHE[key] = code
             
-            with open(fileName) as _FILE:
-                exec(_FILE.read())
+            #Run the code in a dedicated namespace (as a module would be) and retrieve the variables
+            namespace = {"__builtins__":builtins, "__file__":path.abspath(fileName), "this":this, "Dictionary":Dictionary}
+            preset = dict(namespace)
+            exec(code, namespace)
             
-            _LOCALS = locals().copy()
-            for l in _LOCALS.keys():
-                if not l in (_OLDLOCALS + ["_OLDLOCALS", "_LOCALS", "_FILE"]) and (not isinstance(_LOCALS[l], ModuleType)):
-                    this[l] = _LOCALS[l]
+            for l in namespace:
+                if (l in preset) and (namespace[l] is preset[l]):
+                    continue
+                if not l.startswith("_") and (not isinstance(namespace[l], ModuleType)):
+                    this[l] = namespace[l]
             
         except BaseException as err:
             cls.fatalErrorInClass(cls.fromFile,f"Error reading {cls.__name__} from file {fileName}", err)
@@ -109,25 +126,32 @@ class Dictionary(OrderedDict, Utilities):
         Returns:
             varType|Any: self[entryName]
         """
+        #Argument checking (skipped when running with python -O)
+        if __debug__:
+            try:
+                self.checkType(entryName, str, "entryName")
+                if varType is None:
+                    pass
+                elif isinstance(varType, Iterable):
+                    [self.checkType(t, (type, _SpecialGenericAlias), f"varType[{ii}]") for ii,t in enumerate(varType)]
+                else:
+                    self.checkType(varType, (type, _SpecialGenericAlias), f"varType")
+            except BaseException as err:
+                self.fatalErrorInClass(self.lookup,f"Argument checking failed", err)
+        
+        #Single hash look-up on the success path
         try:
-            self.checkType(entryName, str, "entryName")
-            if varType is None:
-                pass
-            elif isinstance(varType, Iterable):
-                [self.checkType(t, (type, _SpecialGenericAlias), f"varType[{ii}]") for ii,t in enumerate(varType)]
-            else:
-                self.checkType(varType, (type, _SpecialGenericAlias), f"varType")
-        except BaseException as err:
-            self.fatalErrorInClass(self.lookup,f"Argument checking failed", err)
-            
-        if not entryName in self:
-            self.fatalErrorInClass(self.lookup, f"Entry '{entryName}' not found in Dictionary. Available entries are:\n\t" + "\n\t".join([str(k) for k in self.keys()]))
-        elif (not varType is None) and (not isinstance(self[entryName], varType)):
+            value = self[entryName]
+        except KeyError:
+            self.fatalErrorInClass(self.lookup, f"Entry '{entryName}' not found in Dictionary. Available entries are:\n\t" + self._availableEntries())
+        
+        #NOTE: isinstance requires a tuple of types
+        if (not varType is None) and (not isinstance(value, tuple(varType) if isinstance(varType, Iterable) else varType)):
             self.fatalErrorInClass(\
                 self.lookup, 
-                f"Entry '{entryName}' of wrong type. {varType.__name__ if not isinstance(varType, Iterable) else [v.__name__ for v in varType]} expected but {self[entryName].__class__.__name__} was found.")
-        else:
-            return self[entryName]
+                f"Entry '{entryName}' of wrong type. {varType.__name__ if not isinstance(varType, Iterable) else [v.__name__ for v in varType]} expected but {value.__class__.__name__} was found.")
+        
+        return value
     
     #############################################################################
     def pop(self, entryName:str):
@@ -140,10 +164,10 @@ class Dictionary(OrderedDict, Utilities):
         try:
             self.checkType(entryName, str, "entryName")
         except BaseException as err:
-            self.fatalErrorInClass(self.lookup,f"Argument checking failed", err)
+            self.fatalErrorInClass(self.pop,f"Argument checking failed", err)
             
         if not entryName in self:
-            self.fatalErrorInClass(self.lookup, f"Entry '{entryName}' not found in Dictionary. Available entries are:\n\t" + "\n\t".join([str(k) for k in self.keys()]))
+            self.fatalErrorInClass(self.pop, f"Entry '{entryName}' not found in Dictionary. Available entries are:\n\t" + self._availableEntries())
         else:
             return super().pop(entryName)
     
@@ -165,35 +189,50 @@ class Dictionary(OrderedDict, Utilities):
         except BaseException as err:
             self.fatalErrorInClass(self.lookupOrDefault,"Argument checking failed", err)
         
-        if not entryName in self:
+        try:
+            value = self[entryName]
+        except KeyError:
             return default
-        else:
-            if not isinstance(self[entryName], type(default)) and fatal:
-                self.fatalErrorInClass(self.lookupOrDefault,f"Inconsistent type of returne value ({type(self[entryName]).__name__}) with default ({type(default).__name__}).", err)
-            return self[entryName]
+        
+        if not isinstance(value, type(default)) and fatal:
+            self.fatalErrorInClass(self.lookupOrDefault,f"Inconsistent type of returne value ({type(value).__name__}) with default ({type(default).__name__}).")
+        return value
+    
+    ######################################
+    def _availableEntries(self, maxEntries:int=50) -> str:
+        """
+        String listing the entries (used for error messages), truncated to maxEntries.
+        """
+        string = "\n\t".join(str(k) for k in islice(self, maxEntries))
+        if len(self) > maxEntries:
+            string += f"\n\t... ({len(self) - maxEntries} more)"
+        return string
+    
+    ######################################
+    def copy(self):
+        """
+        Shallow copy of the Dictionary (dict.copy would return a plain dict).
+        """
+        return self.__class__(self)
     
     ######################################
     def _correctSubdicts(self):
         """
         Convert ricorsively every subdictionary into Dictionary classes.
+        One-shot conversion for entries not inserted through __setitem__.
         """
-        try:
-            for entry in self:
-                if isinstance(self[entry], dict) and not isinstance(self[entry], Dictionary):
-                    self[entry] = Dictionary(**self[entry])
-            return self
-        except BaseException as err:
-            self.fatalErrorInClass(self._correctSubdicts,f"Error updating subdictionary types", err)
+        for entry in self:
+            if isinstance(self[entry], dict) and not isinstance(self[entry], Dictionary):
+                self[entry] = Dictionary(self[entry])
+        return self
     
     
     ######################################
-    def __setitem__(self, *args, **argv):
-        try:
-            super().__setitem__(*args, **argv)
-            self._correctSubdicts()
-            return self
-        except BaseException as err:
-            self.fatalErrorInClass(self.__setitem__,f"Error setting Dictionary item", err)
+    def __setitem__(self, key, value):
+        #Only the new entry needs to be converted (the others already are)
+        if isinstance(value, dict) and not isinstance(value, Dictionary):
+            value = Dictionary(value)
+        super().__setitem__(key, value)
     
     ######################################
     def update(self, **kwargs):
@@ -203,15 +242,11 @@ class Dictionary(OrderedDict, Utilities):
             
         Performs like dict.update() method but recursively updates sub-dictionaries
         """
-        try:
-            for key in kwargs:
-                if (isinstance(kwargs[key],dict)) and (key in self):
-                    self[key].update(**kwargs[key])
-                else:
-                    super().update({key:kwargs[key]})
-                    
-            self._correctSubdicts()
-        except BaseException as err:
-            self.fatalErrorInClass(self.update,f"Error updating dictionary keys", err)
+        for key in kwargs:
+            #Merge only if both are dictionaries
+            if isinstance(kwargs[key],dict) and isinstance(self.get(key), dict):
+                self[key].update(**kwargs[key])
+            else:
+                self[key] = kwargs[key]
         
         return self
@@ -51,6 +51,7 @@ class EngineData(Utilities):
 
     @columns.setter
     def columns(self, *args, **kwargs) -> None:
+        self._clearCache()
         self._data.columns(*args, **kwargs)
 
     ##############################
@@ -72,10 +73,13 @@ class EngineData(Utilities):
         Access a group of rows and columns by label(s) or a boolean array.
         Calls 'loc' propertie of the DataFrame.
         """
+        #Might be used to modify the data
+        self._clearCache()
         return self._data.loc
 
     @loc.setter
     def loc(self, *args):
+        self._clearCache()
         self._data.loc[args[0]] = args[1:]
     
     ##############################
@@ -85,10 +89,13 @@ class EngineData(Utilities):
         Purely integer-location based indexing for selection by position.
         Calls 'iloc' propertie of the DataFrame.
         """
+        #Might be used to modify the data
+        self._clearCache()
         return self._data.iloc
 
     @iloc.setter
     def iloc(self, *args):
+        self._clearCache()
         self._data.iloc[args[0]] = args[1:]
 
     #########################################################################
@@ -98,6 +105,7 @@ class EngineData(Utilities):
         Create the table.
         """
         self._data = pd.DataFrame(columns={"CA":[]})
+        self._arrCache:dict[str,np.ndarray] = {}
 
     #########################################################################
     #Dunder methods:
@@ -118,6 +126,7 @@ class EngineData(Utilities):
         if not key in self.columns:
             new = True
 
+        self._clearCache()
         self._data.__setitem__(key, item)
 
         #Create interpolator if not present
@@ -125,6 +134,7 @@ class EngineData(Utilities):
             self.createInterpolator(key)
 
     def __delitem__(self, item):
+        self._clearCache()
         return self._data.__delitem__(item)
 
     def __call__(self) -> pd.DataFrame:
@@ -133,10 +143,93 @@ class EngineData(Utilities):
         Returns:
             pd.DataFrame: The DataFrame instance that stores the data.
         """
+        #Might be used to modify the data
+        self._clearCache()
         return self._data
     
     #########################################################################
     #Methods:
+    def _clearCache(self) -> None:
+        """
+        Invalidate the cached arrays. Called whenever the data might be modified.
+        """
+        self._arrCache.clear()
+    
+    #######################################
+    def array(self, varName:str) -> np.ndarray:
+        """
+        Access the data of a variable as numpy array (without copying when possible). 
+        The array is cached until the data are modified through this class.
+
+        Args:
+            varName (str): Name of the variable
+
+        Returns:
+            np.ndarray: The time-series of the variable
+        """
+        arr = self._arrCache.get(varName, None)
+        if arr is None:
+            arr = self._arrCache[varName] = self._data[varName].to_numpy()
+        return arr
+    
+    #######################################
+    def col(self, varName:str) -> np.ndarray:
+        """
+        Access the data of a variable as numpy array (without copying when possible). 
+        Same as array.
+
+        Args:
+            varName (str): Name of the variable
+
+        Returns:
+            np.ndarray: The time-series of the variable
+        """
+        return self.array(varName)
+    
+    #######################################
+    def row(self, index:int) -> dict[str,float]:
+        """
+        Access the values of all variables at a given row.
+
+        Args:
+            index (int): The index of the row
+
+        Returns:
+            dict[str,float]: Map [varName->value]
+        """
+        return {varName:self.array(varName)[index] for varName in self._data.columns}
+    
+    #######################################
+    def assign(self, **fields:float|collections.abc.Iterable) -> Self:
+        """
+        Set multiple variables at once (uniform values or time-series). Existing
+        variables are overwritten, while the new ones are appended in a single 
+        block, in the given order.
+        
+        Args:
+            **fields (float|collections.abc.Iterable): The values of the variables
+        
+        Returns:
+            Self: self.
+        
+        Example:
+            >>> ed.assign(T=float("nan"), m=float("nan"))
+        """
+        new = {f:fields[f] for f in fields if not f in self.columns}
+        
+        self._clearCache()
+        for f in fields:
+            if not f in new:
+                self._data[f] = fields[f]
+        
+        if len(new) > 0:
+            self._data = pd.concat([self._data, pd.DataFrame(new, index=self._data.index)], axis=1)
+            for f in new:
+                self.createInterpolator(f)
+        
+        return self
+    
+    #######################################
     def loadFile(
             self,
             fileName:str,
@@ -182,23 +275,74 @@ class EngineData(Utilities):
         Returns:
             Self: self.
         """
+        try:
+            self.checkType(varName  , str   , "varName" )
+            data = self.readFile\
+                (
+                    fileName,
+                    varName,
+                    CACol=CACol,
+                    varCol=varCol,
+                    CAOff=CAOff,
+                    varOff=varOff,
+                    CAscale=CAscale,
+                    varScale=varScale,
+                    skipRows=skipRows,
+                    maxRows=maxRows,
+                    comments=comments,
+                    verbose=verbose,
+                    delimiter=delimiter,
+                )
+            
+            self.loadArray(data, varName, verbose, default, interpolate)
+
+        except BaseException as err:
+            self.fatalErrorInClass(self.loadFile, f"Failed loading field '{varName}' from file '{fileName}'", err)
+
+        return self
+    
+    #######################################
+    @classmethod
+    def readFile(
+            cls,
+            fileName:str,
+            varName:str=None, / , *,
+            CACol:int=0,
+            varCol:int=1,
+            CAOff:float=0.0,
+            varOff:float=0.0,
+            CAscale:float=1.0,
+            varScale:float=1.0,
+            skipRows:int=0,
+            maxRows:int=None,
+            comments:str='#',
+            verbose:bool=True,
+            delimiter:str=None,
+            ) -> np.ndarray:
+        """
+        Read the time-series of a variable from a file, without loading it 
+        in the table. Does not modify any instance, hence it can be used to 
+        read multiple files concurrently. See loadFile for the arguments.
+
+        Returns:
+            np.ndarray: Array of shape [N,2] with the CA range and the variable time-series.
+        """
         if verbose:
-            print(f"{self.__class__.__name__}: Loading... '{fileName}' -> '{varName}'")
+            print(f"{cls.__name__}: Loading... '{fileName}'" + (f" -> '{varName}'" if not varName is None else ""))
         
         try:
-            self.checkType(fileName , str   , "fileName")
-            self.checkType(varName  , str   , "varName" )
-            self.checkType(CACol    , int   , "CACol"   )
-            self.checkType(varCol   , int   , "varCol"  )
-            self.checkType(CAOff    , float , "CAOff"   )
-            self.checkType(varOff   , float , "varOff"  )
-            self.checkType(CAscale  , float , "CAscale" )
-            self.checkType(varScale , float , "varScale")
-            self.checkType(comments , str   , "comments")
-            self.checkType(skipRows , int   , "skipRows")
-            self.checkType(verbose  , bool  , "verbose")
+            cls.checkType(fileName , str   , "fileName")
+            cls.checkType(CACol    , int   , "CACol"   )
+            cls.checkType(varCol   , int   , "varCol"  )
+            cls.checkType(CAOff    , float , "CAOff"   )
+            cls.checkType(varOff   , float , "varOff"  )
+            cls.checkType(CAscale  , float , "CAscale" )
+            cls.checkType(varScale , float , "varScale")
+            cls.checkType(comments , str   , "comments")
+            cls.checkType(skipRows , int   , "skipRows")
+            cls.checkType(verbose  , bool  , "verbose")
             if not maxRows is None:
-                self.checkType(maxRows   , int , "maxRows")
+                cls.checkType(maxRows   , int , "maxRows")
 
             data:np.ndarray = np.loadtxt\
                 (
@@ -215,12 +359,10 @@ class EngineData(Utilities):
             data[:,1] *= varScale
             data[:,1] += varOff
 
-            self.loadArray(data, varName, verbose, default, interpolate)
-
         except BaseException as err:
-            self.fatalErrorInClass(self.loadFile, f"Failed loading field '{varName}' from file '{fileName}'", err)
+            cls.fatalErrorInClass(cls.readFile, f"Failed reading file '{fileName}'", err)
 
-        return self
+        return data
 
     #######################################
     def loadArray(
@@ -343,6 +485,8 @@ class EngineData(Utilities):
             #Check types
             if any([t not in [float, int] for t in df.dtypes]):
                 raise TypeError("Data must be numeric (float or int).")
+            
+            self._clearCache()
 
             #Check if data were already loaded
             firstTime = not (varName in self.columns)
@@ -399,6 +543,88 @@ class EngineData(Utilities):
 
         return self
 
+    #######################################
+    def loadArrays(
+        self,
+        CA:collections.abc.Iterable,
+        var:collections.abc.Iterable,
+        varName:str,
+        verbose:bool=True,
+        default:float=float("nan"),
+        interpolate:bool=False) -> Self:
+        """
+        Load a variable given the CA range and the variable time-series as 
+        separate arrays, without packing them in an array of shape [N,2]. 
+        See loadArray for the other arguments.
+
+        Args:
+            CA (collections.abc.Iterable): The CA range
+            var (collections.abc.Iterable): The variable time-series
+            varName (str): Name of variable in data structure
+
+        Returns:
+            Self: self.
+        """
+        try:
+            if len(CA) != len(var):
+                raise ValueError(f"CA range and variable must have the same length ({len(CA)} != {len(var)}).")
+        except BaseException as err:
+            self.fatalErrorInClass(self.loadArrays, f"Failed loading arrays", err)
+        
+        return self.loadArray(pd.DataFrame({"CA":CA, varName:var}), varName, verbose, default, interpolate)
+    
+    #######################################
+    def loadDict(self, data:dict[str,collections.abc.Iterable], verbose:bool=True) -> Self:
+        """
+        Load multiple variables sharing the same CA range. If the table is empty, the
+        data are stored at once, otherwise each variable is loaded through loadArray.
+        Automatically removes duplicate times.
+
+        Args:
+            data (dict[str,collections.abc.Iterable]): Dictionary with the CA range (entry 'CA') 
+                and the time-series of the variables to load.
+            verbose (bool, optional): If need to print loading information. Defaults to True.
+
+        Returns:
+            Self: self.
+        """
+        try:
+            self.checkType(data, dict, "data")
+            if not "CA" in data:
+                raise ValueError("Entry 'CA' not found in data.")
+            
+            #If data were already stored, merge each variable
+            if len(self._data) > 0:
+                CA = data["CA"]
+                for varName in data:
+                    if varName != "CA":
+                        self.loadArrays(CA, data[varName], varName, verbose)
+                return self
+            
+            #Construct the DataFrame at once (CA first)
+            df:pd.DataFrame = pd.DataFrame(data={"CA":data["CA"], **{v:data[v] for v in data if v != "CA"}})
+            
+            #Remove duplicates
+            df.drop_duplicates(subset="CA", keep="first", inplace=True)
+            df.reset_index(drop=True, inplace=True)
+            
+            #Check types
+            if any([t not in [float, int] for t in df.dtypes]):
+                raise TypeError("Data must be numeric (float or int).")
+            
+            self._clearCache()
+            self._data = df
+            
+            #Create the interpolators
+            for varName in df.columns:
+                if varName != "CA":
+                    self.createInterpolator(varName)
+            
+        except BaseException as err:
+            self.fatalErrorInClass(self.loadDict, f"Failed loading dictionary", err)
+        
+        return self
+    
     #######################################
     def createInterpolator(self, varName:str):
         """
@@ -421,7 +647,7 @@ class EngineData(Utilities):
             def interpolator(self, CA:float|collections.abc.Iterable) -> float|collections.abc.Iterable:
                 try:
                     self.checkTypes(CA, (float,collections.abc.Iterable), "CA")
-                    return self.np.interp(CA, self._data["CA"], self._data[varName], float("nan"), float("nan"))
+                    return self.np.interp(CA, self.array("CA"), self.array(varName), float("nan"), float("nan"))
                 except BaseException as err:
                     self.fatalErrorInClass(getattr(self,varName), "Failed interpolation", err)
 
@@ -18,6 +18,7 @@ from matplotlib.axes import Axes
 
 #Other
 from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 import os
 from tqdm import tqdm
 
@@ -46,6 +47,15 @@ from libICEpost.src.engineModel.HeatTransferModel.Woschni import Woschni
 #Database
 from libICEpost.Database.chemistry.specie.Mixtures import Mixtures, Mixture
 
+#############################################################################
+#                           Auxiliary variables                             #
+#############################################################################
+_attrGetters:dict[str,attrgetter] = {}
+"""Cache of the attribute getters for '@<method>' entries of initial conditions"""
+
+_initSchemas:dict[tuple,tuple[dict[str,float],list[tuple[str,str]],list[tuple[str,attrgetter]]]] = {}
+"""Cache of the compiled initial conditions (see EngineModel._compileInitSchema)"""
+
 #############################################################################
 #                               MAIN CLASSES                                #
 #############################################################################
@@ -122,6 +132,55 @@ class EngineModel(BaseClass):
     info:Dictionary
     """General information for pre-post processing"""
     
+    _zoneAttr:dict[str,str]
+    """Name of the attribute storing the thermodynamic model of each zone ("_<zoneName>")"""
+    
+    _zoneSuffix:dict[str,str]
+    """Suffix appended to the fields referred to each zone ("_<zoneName>", empty for cylinder)"""
+    
+    _dataCA:np.ndarray|None = None
+    """The CA range of the processed data (cached for look-up of time indexes)"""
+    
+    _timeTolerance:float = 1e-6
+    """Tolerance for looking-up times in the processed data [CAD]"""
+    
+    _dataCols:dict[str,np.ndarray]|None = None
+    """The filtered data fields as arrays (cached for updating the combustion model)"""
+    
+    _dataFormatHandlers:dict[str,str] = \
+        {
+            "file":"_loadFormatFile",
+            "array":"_loadFormatArray",
+            "function":"_loadFormatFunction",
+            "uniform":"_loadFormatUniform",
+            "calc":"_loadFormatCalc",
+        }
+    """Methods used to load data for each format in loadData (can be extended by derived classes)"""
+    
+    _maxReadThreads:int = 8
+    """Maximum number of threads used to read files concurrently in loadData"""
+    
+    _CAindex:dict[float,int]
+    """Map from CA to the corresponding row in the processed data (built before the time-loop)"""
+    
+    _precomputed:dict[str,np.ndarray]
+    """Input fields of the time-loop evaluated on the whole time series before the loop (p, V, dVdCA, dpdCA)"""
+    
+    _results:dict[str,np.ndarray]
+    """Fields computed in the time-loop, stored to self.data after the loop (child classes may add their own)"""
+    
+    _species:dict[str,int]
+    """Index of each specie in the buffer of the mixture composition (self._speciesBuffer)"""
+    
+    _speciesCols:dict[tuple[str,...],list[int]]
+    """Columns in self._speciesBuffer of the species of each mixture (by tuple of specie names) met in the time-loop"""
+    
+    _speciesBuffer:np.ndarray
+    """Mixture composition computed in the time-loop, with shape [len(data), nSpecies, 2] (mole and mass fractions)"""
+    
+    _dUsdCA:np.ndarray
+    """Time derivative of the sensible internal energy of the cylinder computed in the time-loop [J/CA]"""
+    
     #########################################################################
     # Properties
     @property
@@ -256,9 +315,38 @@ class EngineModel(BaseClass):
             out = cls(time=ET, geometry=EG, thermophysicalProperties=thermophysicalProperties, combustionProperties=combustionProperties, dataDict=dataDict, **subModels)
             return out
             
-        except BaseException as err:
+        except Exception as err:
             cls.fatalErrorInClass(cls.fromDictionary, "Failed contruction from dictionary", err)
     
+    ####################################
+    @classmethod
+    def _defaultSubmodel(cls, model:str) -> BaseClass:
+        """
+        Get a new instance of the default initializer of a sub-model (copy of the 
+        prototype in cls.Submodels, which is never modified).
+
+        Args:
+            model (str): the name of the sub-model
+
+        Returns:
+            BaseClass: the sub-model
+        """
+        return cls.Submodels[model].copy()
+    
+    ####################################
+    @staticmethod
+    def _asDictionary(dictionary:dict|Dictionary) -> Dictionary:
+        """
+        Cast a dict to Dictionary, without copying if it is already a Dictionary.
+
+        Args:
+            dictionary (dict | Dictionary): the dictionary to cast
+
+        Returns:
+            Dictionary
+        """
+        return dictionary if isinstance(dictionary, Dictionary) else Dictionary(dictionary)
+    
     #########################################################################
     #Constructor:
     def __init__(self, *,
@@ -288,6 +376,10 @@ class EngineModel(BaseClass):
             self.geometry = geometry
             self.time = time
             
+            #Names of zone attributes and fields
+            self._zoneAttr = {zone:"_" + zone for zone in self.Zones}
+            self._zoneSuffix = {zone:("_" + zone if zone != "cylinder" else "") for zone in self.Zones}
+            
             #Data structures
             self._raw = EngineData()     #Raw data
             self._data = EngineData()    #Filtered data
@@ -298,22 +390,22 @@ class EngineModel(BaseClass):
                     #Get from input
                     sm = submodels[model]
                     self.checkType(sm, self.Types[model], f"{submodels}[{model}]")
+                elif hasattr(self, f"_construct{model}"):
+                    #Constructed afterwards (_constructEgrModel, _constructCombustionModel)
+                    continue
                 else:
                     #Take default
-                    sm = self.Submodels[model].copy()
+                    sm = self._defaultSubmodel(model)
                 #Set sub-model
-                self.__setattr__(model, sm)
+                setattr(self, model, sm)
             
             #Thermos
             self.checkType(thermophysicalProperties, dict, "thermophysicalProperties")
-            if isinstance(thermophysicalProperties, dict):
-                thermophysicalProperties = Dictionary(**thermophysicalProperties)
-            self.thermophysicalProperties = thermophysicalProperties.copy()
+            self.thermophysicalProperties = Dictionary(thermophysicalProperties)
             
-            #Combustion properties
+            #Combustion properties (working copy, updated during construction of sub-models)
             self.checkType(combustionProperties, dict, "combustionProperties")
-            if isinstance(combustionProperties, dict):
-                combustionProperties = Dictionary(**combustionProperties)
+            combustionProperties = Dictionary(combustionProperties)
             self.combustionProperties = combustionProperties.copy()
             
             #Contruct the thermodynamic models
@@ -338,7 +430,7 @@ class EngineModel(BaseClass):
             if not dataDict is None:
                 self.preProcess(**dataDict)
             
-        except BaseException as err:
+        except Exception as err:
             self.fatalErrorInClass(self.__init__, f"Failed constructing instance of class {self.__class__.__name__}", err)
     
     #########################################################################
@@ -357,8 +449,7 @@ class EngineModel(BaseClass):
             EngineModel: self
         """
         self.checkType(combustionProperties, dict, "combustionProperties")
-        if not isinstance(combustionProperties, Dictionary):
-            combustionProperties = Dictionary(**combustionProperties)
+        combustionProperties = self._asDictionary(combustionProperties)
             
         #Air composition
         air = combustionProperties.lookupOrDefault("air", Mixtures.dryAir)
@@ -366,7 +457,7 @@ class EngineModel(BaseClass):
         
         #Here set everything to air, in sub-classes update
         for zone in self.Zones:
-            self.__setattr__("_" + zone, ThermoModel(ThermoMixture(self._air.copy(), **self.thermophysicalProperties)))
+            setattr(self, self._zoneAttr[zone], ThermoModel(ThermoMixture(self._air.copy(), **self.thermophysicalProperties)))
         return self
     
     ####################################
@@ -384,22 +475,21 @@ class EngineModel(BaseClass):
         print("Constructing EGR model")
         
         self.checkType(combustionProperties, dict, "combustionProperties")
-        if not isinstance(combustionProperties, Dictionary):
-            combustionProperties = Dictionary(**combustionProperties)
+        combustionProperties = self._asDictionary(combustionProperties)
         
         if "EgrModel" in combustionProperties:
             #Construct egr model from combustion properties
             egrModelType:str = combustionProperties.lookup("EgrModel")
             egrModelDict = combustionProperties.lookupOrDefault(egrModelType + "Dict", Dictionary())
             egrModelDict.update(reactants=self._cylinder.mixture.mix) #Append to dictionary the cylinder properties
+            
+            #NOTE: When introducing the injection models, need to compute EVO composition instead
+            
+            #Construct the EGR model
+            self.EgrModel = EgrModel.selector(egrModelType, egrModelDict)
         else:
             #Use default
-            self.EgrModel = self.Submodels["EgrModel"].copy().update(reactants=self._cylinder.mixture.mix)
-        
-        #NOTE: When introducing the injection models, need to compute EVO composition instead
-        
-        #Construct the EGR model
-        self.EgrModel = EgrModel.selector(egrModelType, egrModelDict)
+            self.EgrModel = self._defaultSubmodel("EgrModel")
         
         print(f"\tType: {self.EgrModel.__class__.__name__}")
         
@@ -422,8 +512,7 @@ class EngineModel(BaseClass):
         print("Constructing combustion model")
         
         self.checkType(combustionProperties, dict, "combustionProperties")
-        if not isinstance(combustionProperties, Dictionary):
-            combustionProperties = Dictionary(**combustionProperties)
+        combustionProperties = self._asDictionary(combustionProperties)
         
         combustionModelType = combustionProperties.lookupOrDefault("CombustionModel", None, fatal=False)
         if not combustionModelType is None:
@@ -437,7 +526,7 @@ class EngineModel(BaseClass):
             self.CombustionModel = CombustionModel.selector(combustionModelType, combustionModelDict)
         else:
             #Use default
-            self.CombustionModel = self.Submodels["CombustionModel"].copy().update(reactants=self._cylinder.mixture.mix)
+            self.CombustionModel = self._defaultSubmodel("CombustionModel").update(reactants=self._cylinder.mixture.mix)
         
         print(f"\tType: {self.CombustionModel.__class__.__name__}")
         
@@ -466,10 +555,37 @@ class EngineModel(BaseClass):
         """
         #TODO: Update the reactants mixture based on injection models (may have already injected some mass)
         
-        index = self.data.index[self.data['CA'] == self.time.time].tolist()[0]
-        data = self.data.loc[index].to_dict()
+        index = self._timeIndex(self.time.time)
+        if self._dataCols is None:
+            self._dataCols = {c:self.data.array(c) for c in self.data.columns}
+        data = {c:a[index] for c, a in self._dataCols.items()}
         self.CombustionModel.update(**data) #NOTE: update also fuel when implementing injection models
     
+    ####################################
+    def _timeIndex(self, CA:float) -> int:
+        """
+        Get the index of time CA in the processed data (self.data), 
+        through binary search on the (sorted) CA range. The closest
+        time is accepted if within tolerance (self._timeTolerance).
+        
+        Args:
+            CA (float): The time to look-up
+        
+        Returns:
+            int: the index
+        """
+        CAarray = self._dataCA
+        if (CAarray is None) or (len(CAarray) != len(self.data)):
+            CAarray = self._dataCA = self.data.array("CA")
+        
+        index = int(np.searchsorted(CAarray, CA))
+        #Take the closest between the neighbouring times
+        if (index > 0) and ((index == len(CAarray)) or (abs(CAarray[index-1] - CA) <= abs(CAarray[index] - CA))):
+            index -= 1
+        if (len(CAarray) < 1) or not (abs(CAarray[index] - CA) <= self._timeTolerance):
+            raise IndexError(f"Time {CA} not found in data.")
+        return index
+    
     #########################################################################
     #Dunder methods:
     def __str__(self):
@@ -503,6 +619,126 @@ class EngineModel(BaseClass):
         self._raw.loadArray(*args,**argv)
         return self
     
+    ####################################
+    def _loadArrays(self,*args,**argv):
+        """
+        Loads the CA range and the data as separate arrays to self.raw. 
+        See EngineData.loadArrays documentation for arguments:
+        """
+        self._raw.loadArrays(*args,**argv)
+        return self
+    
+    ####################################
+    def _loadFormatFile(self, currData:Dictionary, entryName:str, opts:Dictionary, *, dataPath:str=None, label:str="") -> None:
+        """
+        Load an entry from file (format 'file'). The file name is relative 
+        to dataPath if given.
+        """
+        #Load
+        self._loadFile(self._fileName(currData, dataPath), entryName, **opts)
+    
+    ####################################
+    @staticmethod
+    def _fileName(currData:Dictionary, dataPath:str=None) -> str:
+        """
+        The name of the file to load for an entry with format 'file' (relative to dataPath if given).
+        """
+        return (dataPath + os.path.sep if dataPath else "") + currData.lookup("fileName")
+    
+    ####################################
+    def _readFiles(self, plan:list[tuple[str,str,Dictionary,Dictionary,str]], dataPath:str=None) -> dict[int,np.ndarray]:
+        """
+        Read concurrently the files of the entries with format 'file' in a load plan 
+        (see _buildLoadPlan), when more than one. Files are only read here: the data 
+        are then loaded to self.raw in the order of the plan.
+
+        Args:
+            plan (list[tuple[str,str,Dictionary,Dictionary,str]]): The load plan
+            dataPath (str, optional): Global path where to load data. Defaults to None.
+
+        Returns:
+            dict[int,np.ndarray]: Map [index in plan -> array of shape [N,2] with CA and data]
+        """
+        ops = {ii:op for ii, op in enumerate(plan) if self._dataFormatHandlers[op[0]] == "_loadFormatFile"}
+        if len(ops) < 2:
+            return {}
+        
+        def read(op):
+            _, entryName, currData, opts, _ = op
+            readOpts = {k:v for k,v in opts.items() if not k in ("default", "interpolate")}
+            return self._raw.readFile(self._fileName(currData, dataPath), entryName, **readOpts)
+        
+        with ThreadPoolExecutor(max_workers=min(self._maxReadThreads, len(ops))) as pool:
+            futures = {ii:pool.submit(read, op) for ii, op in ops.items()}
+        
+        return {ii:f.result() for ii, f in futures.items()}
+    
+    ####################################
+    def _loadFormatArray(self, currData:Dictionary, entryName:str, opts:Dictionary, *, dataPath:str=None, label:str="") -> None:
+        """
+        Load an entry from a (CA,val) array (format 'array').
+        """
+        dataArray = currData.lookup("array")
+        self._loadArray(dataArray, entryName, **opts)
+    
+    ####################################
+    def _loadFormatFunction(self, currData:Dictionary, entryName:str, opts:Dictionary, *, dataPath:str=None, label:str="") -> None:
+        """
+        Load an entry from a function f(CA) evaluated on the CA range 
+        of the raw data (format 'function').
+        """
+        function:FunctionType = currData.lookup("function")
+        self.checkType(function, FunctionType, f"{label}[function]")
+        
+        CA = self._raw.array("CA")
+        try:
+            #Try calling on the whole array (numpy-compatible functions)
+            f = np.asarray(function(CA), dtype=float)
+            if f.shape != CA.shape:
+                raise ValueError("Inconsistent shape")
+        except Exception:
+            #Fallback to element-wise evaluation
+            f = np.vectorize(function, otypes=[float])(CA)
+        
+        self._loadArrays(CA, f, entryName, **opts)
+    
+    ####################################
+    def _loadFormatUniform(self, currData:Dictionary, entryName:str, opts:Dictionary, *, dataPath:str=None, label:str="") -> None:
+        """
+        Set an entry to a uniform value (format 'uniform').
+        """
+        value:float = currData.lookup("value")
+        self.checkType(value, float, f"{label}[value]")
+        if len(self.raw) < 1:
+            raise ValueError(f"Cannot set uniform value for entry {label} before loading data with a CA range.")
+        self.raw[entryName] = np.full(len(self.raw), value, dtype=float)
+    
+    ####################################
+    def _loadFormatCalc(self, currData:Dictionary, entryName:str, opts:Dictionary, *, dataPath:str=None, label:str="") -> None:
+        """
+        Compute an entry applying an operation between already loaded 
+        data (format 'calc'). The arguments of the function are the 
+        names of the fields to use.
+        """
+        function:FunctionType = currData.lookup("function")
+        self.checkType(function, FunctionType, f"{label}[function]")
+        
+        #Function arguments
+        argNames:list[str] = function.__code__.co_varnames[:function.__code__.co_argcount]
+        
+        #Check if are present:
+        for arg in argNames:
+            if not arg in self.raw.columns:
+                raise ValueError(f"Field '{arg}' was not loaded.")
+        
+        #Extract corresponding columns from data-frame:
+        cols = {c:self.raw[c] for c in argNames}
+        
+        CA = self._raw.array("CA")
+        f = function(**cols)
+        
+        self._loadArrays(CA, f, entryName, **opts)
+    
     ####################################
     def loadData(self, dataPath:str=None, *, data:dict|Dictionary) -> EngineModel:
         """
@@ -524,85 +760,66 @@ class EngineModel(BaseClass):
         self.info["dataPath"] = dataPath
         
         #Cast to Dictionary
-        data = Dictionary(**data)
+        data = self._asDictionary(data)
         self.info["data"] = data
         
+        plan = self._buildLoadPlan(data)
+        
+        #Read the files concurrently (I/O bound)
+        files = self._readFiles(plan, dataPath)
+        
         #Load data:
+        for ii, (dataFormat, entryName, currData, opts, label) in enumerate(plan):
+            if ii in files:
+                loadOpts = {k:v for k,v in opts.items() if k in ("verbose", "default", "interpolate")}
+                self._loadArray(files[ii], entryName, **loadOpts)
+            else:
+                getattr(self, self._dataFormatHandlers[dataFormat])(currData, entryName, opts, dataPath=dataPath, label=label)
+        
+        return self
+    
+    ####################################
+    def _buildLoadPlan(self, data:Dictionary) -> list[tuple[str,str,Dictionary,Dictionary,str]]:
+        """
+        Walk the data dictionary given to loadData and collect the entries to 
+        load, checking their consistency before loading anything.
+
+        Args:
+            data (Dictionary): Dictionary containing the data to load for each region.
+
+        Returns:
+            list[tuple[str,str,Dictionary,Dictionary,str]]: The list of entries to load, in 
+                the order of loading, as (format, entryName, data, opts, label).
+        """
+        plan:list[tuple[str,str,Dictionary,Dictionary,str]] = []
+        planned:set[str] = set()
         for zone in self.Zones:
             zoneDict = data.lookup(zone)
             
             #Check that pressure is found (mandatory)
-            if (not "p" in zoneDict) and (not "p" in self.raw.columns):
+            if (not "p" in zoneDict) and (not "p" in planned) and (not "p" in self.raw.columns):
                 raise ValueError(f"Mandatory entry 'p' in data dictionary for zone {zone} not found. Pressure trace must be loaded for each thermodynamic region.")
             
             #Loop over data to be loaded:
             for entry in zoneDict:
+                label = f"{zone}[{entry}]"
                 dataDict = zoneDict.lookup(entry)
-                self.checkType(dataDict, Dictionary, f"{zone}[{entry}]")
+                self.checkType(dataDict, Dictionary, label)
                 
                 #If the region is not cylinder, append its name to the field
-                entryName:str = entry + (f"_{zone}" if zone != "cylinder" else "")
+                entryName:str = entry + self._zoneSuffix[zone]
                 currData:Dictionary = dataDict.lookup("data")
                 opts:Dictionary = currData.lookupOrDefault("opts", Dictionary())
                 
-                #Get format
+                #Get format and check that it can be handled
                 dataFormat:str = dataDict.lookup("format")
-                if (dataFormat == "file"):
-                    #File
-                    fileName = currData.lookup("fileName")
-                    
-                    #relative to dataPath if given
-                    fileName = (dataPath + os.path.sep if dataPath else "") + fileName
-                    
-                    #Load
-                    self._loadFile(fileName, entryName, **opts)
-                    
-                elif (dataFormat == "array"):
-                    #(CA,val) array
-                    dataArray = currData.lookup("array")
-                    self._loadArray(dataArray, entryName, **opts)
+                if not dataFormat in self._dataFormatHandlers:
+                    raise ValueError(f"Unknown data format '{dataFormat}' for entry {label}. Available formats are: {list(self._dataFormatHandlers.keys())}")
                 
-                elif (dataFormat == "function"):
-                    #Function f(CA)
-                    function:FunctionType = currData.lookup("function")
-                    self.checkType(function, FunctionType, f"{zone}[{entry}][function]")
-                    
-                    CA = self.raw["CA"]
-                    f = CA.apply(function)
-                    
-                    self._loadArray(np.array((CA,f)).T, entryName, **opts)
-                    
-                elif (dataFormat == "uniform"):
-                    #Uniform value
-                    value:float = currData.lookup("value")
-                    self.checkType(value, float, f"{zone}[{entry}][value]")
-                    self.raw[entryName] = value
-                
-                elif (dataFormat == "calc"):
-                    #Apply operation between alredy loaded data
-                    function:FunctionType = currData.lookup("function")
-                    self.checkType(function, FunctionType, f"{zone}[{entry}][function]")
-                    
-                    #Function arguments
-                    argNames:list[str] = function.__code__.co_varnames[:function.__code__.co_argcount]
-                    
-                    #Check if are present:
-                    for arg in argNames:
-                        if not arg in self.raw.columns:
-                            raise ValueError(f"Field '{arg}' was not loaded.")
-                    
-                    #Extract corresponding columns from data-frame:
-                    cols = {c:self.raw[c] for c in argNames}
-                    
-                    CA = self.raw["CA"]
-                    f = function(**cols)
-                    
-                    self._loadArray(np.array((CA,f)).T, entryName, **opts)
-                
-                else:
-                    raise ValueError(f"Unknown data format '{dataFormat}' for entry {zone}[{entry}]")
-                    
-        return self
+                plan.append((dataFormat, entryName, currData, opts, label))
+                planned.add(entryName)
+        
+        return plan
     
     ####################################
     def filterData(self, filter:"Filter|FunctionType|None"=None) -> EngineModel:
@@ -620,20 +837,43 @@ class EngineModel(BaseClass):
             #Save filter
             self.info["filter"] = filter
             
+            #Reset the cached arrays
+            self._dataCA = None
+            self._dataCols = None
+            
             #Clone if no filter is given
             if filter is None:
-                for field in self._raw.columns:
-                    self._data.loadArray(np.array((self._raw["CA"],self._raw[field])).T, field)
-                return self
+                self._data.loadDict({var:self._raw.array(var) for var in self._raw.columns})
             
-            #Apply filter
-            print(f"Applying filter {filter if isinstance(filter,Filter) else filter.__name__}")
-            for var in self._raw.columns:
-                #Filter data
-                if var != "CA":
-                    self._data.loadArray(np.array(filter(self._raw["CA"], self._raw[var])).T, var)
+            else:
+                #Apply filter
+                print(f"Applying filter {filter if isinstance(filter,Filter) else filter.__name__}")
+                rawCA = self._raw.array("CA")
+                fields = [var for var in self._raw.columns if var != "CA"]
+                
+                if isinstance(filter, Filter) and (type(filter).batch is not Filter.batch) and (len(fields) > 0):
+                    #Filter all fields at once (only for filters implementing batch processing, 
+                    #the others are applied by field, as user-defined filters might resample 
+                    #each field differently)
+                    CA, Y = filter.batch(rawCA, np.column_stack([self._raw.array(var) for var in fields]))
+                    self._data.loadDict({"CA":np.asarray(CA), **{var:Y[:,ii] for ii, var in enumerate(fields)}})
+                
+                else:
+                    filtered = {var:filter(rawCA, self._raw.array(var)) for var in fields}
+                    
+                    #Store at once if all fields were filtered to the same CA range
+                    CA = np.asarray(next(iter(filtered.values()))[0]) if filtered else None
+                    if filtered and all(np.array_equal(filtered[var][0], CA) for var in filtered):
+                        self._data.loadDict({"CA":CA, **{var:np.asarray(filtered[var][1]) for var in filtered}})
+                    else:
+                        for var in filtered:
+                            self._data.loadArrays(*filtered[var], var)
             
-        except BaseException as err:
+            #Cache the arrays
+            self._dataCols = {c:self._data.array(c) for c in self._data.columns}
+            self._dataCA = self._dataCols["CA"]
+            
+        except Exception as err:
             self.fatalErrorInClass(self.filterData, f"Failed filtering data", err)
         
         return self
@@ -674,7 +914,7 @@ class EngineModel(BaseClass):
             #Update the mixtures at start-time (combustion models, injection models, etc.)
             self._updateMixtures()
             
-            initialConditions = Dictionary(**initialConditions)
+            initialConditions = self._asDictionary(initialConditions)
             #Store initial conditions
             self.info["initialConditions"] = initialConditions
             
@@ -682,9 +922,9 @@ class EngineModel(BaseClass):
                 zoneDict = initialConditions.lookup(zone)
                 self.checkType(zoneDict, dict, "zoneDict")
                 
-                attrgetter("_" + zone)(self).initializeState(**self._preprocessThermoModelInput(zoneDict, zone=zone))
+                getattr(self, self._zoneAttr[zone]).initializeState(**self._preprocessThermoModelInput(zoneDict, zone=zone))
 
-        except BaseException as err:
+        except Exception as err:
             self.fatalErrorInClass(self.filterData, f"Failed initializing thermodynamic regions", err)
         
         return self
@@ -718,31 +958,78 @@ class EngineModel(BaseClass):
         Returns:
             dict: processed dictionary
         """
-        #TODO error handling
-        
-        outputDict = {}
+        floats, interps, methods = self._compileInitSchema(inputDict, zone)
+        startTime:float = self.time.startTime
+        
+        #Float -> use value
+        outputDict = floats.copy()
+        
+        #str -> interpolate
+        if interps:
+            CA = self.data.array("CA")
+            for key, field in interps:
+                if not field in self.data.columns:
+                    raise ValueError(f"Field '{field}' not found in data ({key}).")
+                outputDict[key] = np.interp(startTime, CA, self.data.array(field), float("nan"), float("nan"))
+        
+        #str with @ -> apply method
+        for key, getter in methods:
+            outputDict[key] = getter(self)(startTime)
+        
+        #Keep the order of the input dictionary
+        return {key:outputDict[key] for key in inputDict}
+    
+    ####################################
+    def _compileInitSchema(self, inputDict:dict, zone:str) -> tuple[dict[str,float],list[tuple[str,str]],list[tuple[str,attrgetter]]]:
+        """
+        Split the entries of the input dictionary for initialization of a 
+        thermodynamic region by type (cached for each zone and input dictionary):
+            float -> value
+            str -> name of the field to interpolate (with the zone suffix)
+            str starting with '@' -> getter of the method to apply
+
+        Args:
+            inputDict (dict): dictionary for thermodynamic inputs
+            zone (str): the zone name
+
+        Returns:
+            tuple[dict[str,float],list[tuple[str,str]],list[tuple[str,attrgetter]]]: 
+                The values, the (key, field) and the (key, getter) pairs.
+        """
+        try:
+            cacheKey = (zone, tuple(inputDict.items()))
+            schema = _initSchemas.get(cacheKey)
+        except TypeError:
+            #Not hashable (the type error is raised below)
+            cacheKey = None
+            schema = None
+        if not schema is None:
+            return schema
+        
+        floats:dict[str,float] = {}
+        interps:list[tuple[str,str]] = []
+        methods:list[tuple[str,attrgetter]] = []
         for key in inputDict:
             val = inputDict[key]
             
             if isinstance(val,float):
-                #Float -> use value
-                outputDict[key] = val
+                floats[key] = val
             elif isinstance(val,str):
-                #str
-                startTime:float = self.time.startTime
-                
                 if val.startswith("@"):
-                    #str with @ -> apply method
-                    code = f"outputDict[key] = self.{val[1:]}(startTime)"
-                    exec(code)
+                    getter = _attrGetters.get(val)
+                    if getter is None:
+                        getter = _attrGetters[val] = attrgetter(val[1:])
+                    methods.append((key, getter))
                 else:
-                    #str -> interpolate
-                    outputDict[key] = attrgetter(val + (f"_{zone}" if not (zone == "cylinder") else ""))(self.data)(startTime)
+                    interps.append((key, val + self._zoneSuffix[zone]))
             else:
                 #Error
                 raise TypeError(f"Type '{val.__class__.__name__}' not supported ({key}).")
         
-        return outputDict
+        schema = (floats, interps, methods)
+        if not cacheKey is None:
+            _initSchemas[cacheKey] = schema
+        return schema
     
     ####################################
     def preProcess(self, dataPath:str=None, *, data:dict|Dictionary, preProcessing:dict|Dictionary=None, initialConditions:dict|Dictionary, **junk) -> EngineModel:
@@ -779,7 +1066,7 @@ class EngineModel(BaseClass):
         self.info["preProcessing"] = preProcessing
         filter = None
         if not preProcessing is None:
-            preProcessing = Dictionary(**preProcessing)
+            preProcessing = self._asDictionary(preProcessing)
             filterType = preProcessing.lookupOrDefault("Filter", None, fatal=False)
             if isinstance(filterType, str):
                 #Got type name for run-time construction
@@ -806,33 +1093,50 @@ class EngineModel(BaseClass):
         
         This is split into two function calls, which may be overwritten in child classes to tailored processings:
         1) _process__pre__: Create the columns in self.data for the fields generted by post-processing
-        2) _update: The state-updating procedure in the main time-loop
-        3) _process__post__: Final post-processing (e.g., computation of wall heat fluxes and rohr)
+        2) _timeLoop: The main time-loop, calling _update at each time-step
+        3) _storeResults: Store the fields computed in the time-loop to self.data
+        4) _computeAHRR: Computation of the apparent heat release rate on the whole time series
+        5) _process__post__: Final post-processing (e.g., computation of wall heat fluxes and rohr)
         
         Returns:
             EngineModel: self
         """
+        print("")
+        print("Processing")
+        print("startTime:",self.time.startTime)
+        print("endTime:",self.time.endTime)
+        
         try:
-            print("")
-            print("Processing")
-            print("startTime:",self.time.startTime)
-            print("endTime:",self.time.endTime)
-            
             #Create fields
             self._process__pre__()
             
             #Process cylinder data
-            for t in tqdm(self.time(self.data["CA"]), "Progress: ", initial=0, total=(self.time.endTime-self.time.startTime), unit="CAD"):  #With progress bar :)
-                self.info["time"] = t
-                self._update()
+            self._timeLoop()
+            
+            #Store the results of the time-loop
+            self._storeResults()
+            
+            #Apparent heat release rate
+            self._computeAHRR()
 
             #Final updates (heat transfer, cumulatives, etc...)
             self._process__post__()
             
             return self
-        except BaseException as err:
+        except Exception as err:
             self.fatalErrorInClass(self.process, f"Failed processing data for engine model {self.__class__.__name__}", err)
     
+    ####################################
+    def _timeLoop(self) -> None:
+        """
+        The main time-loop, from start-time to end-time, updating the 
+        state through _update. Exceptions are handled by process.
+        """
+        info = self.info
+        for t in tqdm(self.time(self.data.array("CA")), "Progress: ", initial=0, total=(self.time.endTime-self.time.startTime), unit="CAD"):  #With progress bar :)
+            info["time"] = t
+            self._update()
+    
     ####################################
     def _process__pre__(self) -> None:
         """
@@ -844,40 +1148,69 @@ class EngineModel(BaseClass):
                 super()._process__pre__()
                 ...
         """
-        #Add fields to data:
+        #Buffer for the mixture composition computed in the time-loop, with
+        #all the species known before the loop (in-cylinder mixture, fresh
+        #mixture and combustion products)
+        self._species = {}
+        self._speciesCols = {}
+        self._speciesBuffer = np.zeros((len(self.data), 0, 2))
+        for mix in (self._cylinder.mixture.mix, self.CombustionModel.freshMixture, self.CombustionModel.combustionProducts):
+            for name in mix.specieNames:
+                if not name in self._species:
+                    self._addSpecie(name)
+        
+        #Add fields to data (at once):
         fields = ["dpdCA", "V", "T", "m", "gamma", "AHRR", "ROHR", "A"]
-        for f in fields:
-            if not f in self.data.columns:
-                self.data[f] = float("nan")
+        newFields = {f:float("nan") for f in fields if not f in self.data.columns}
         
         #Specie
-        for specie in self._cylinder.mixture.mix:
-            self.data[specie.specie.name + "_x"] = 0.0
-            self.data[specie.specie.name + "_y"] = 0.0
+        for name in self._species:
+            newFields[name + "_x"] = 0.0
+            newFields[name + "_y"] = 0.0
+        
+        self.data.assign(**newFields)
+        
+        #Rows corresponding to each time (the times in the loop are taken from the data)
+        self._CAindex = {CA:ii for ii, CA in enumerate(self.data.array("CA").tolist())}
+        
+        #Pressure, volume and their derivatives at all times
+        CAarray = self.data.array("CA")
+        pArray = self.data.array("p")
+        dpdCA = np.full(len(pArray), float("nan"))
+        np.divide(np.diff(pArray), np.diff(CAarray), out=dpdCA[1:]) #Backward differences, as in the time-loop
+        self._precomputed = \
+            {
+                "p":pArray,
+                "V":self.geometry.V(CAarray),
+                "dVdCA":self.geometry.dVdCA(CAarray),
+                "dpdCA":dpdCA,
+            }
+        
+        #Derivative of internal energy, used to compute the AHRR after the time-loop
+        self._dUsdCA = np.full(len(self.data), float("nan"))
+        
+        #Buffers for the fields computed in the time-loop
+        self._results = {f:self.data.array(f).copy() for f in ["dpdCA", "V", "T", "m", "gamma"]}
         
         #Set initial values as start-time:
         CA = self.time.time
         if CA == self.time.startTime:
-            index = self.data.index[self.data['CA'] == CA].tolist()
+            index = self._CAindex[CA]
             
             #In-cylinder data
-            V = self.geometry.V(CA)
-            p = self.data.p(CA)
+            p = self._precomputed["p"][index]
             T = self._cylinder.state.T
             m = self._cylinder.state.m
-            gamma = self._cylinder.mixture.gamma(p,T)
-            self.data.loc[index, "V"] = V
-            self.data.loc[index, "T"] = T
+            self._results["V"][index] = self._precomputed["V"][index]
+            self._results["T"][index] = T
+            self._results["gamma"][index] = self._cylinder.mixture.gamma(p,T)
             self.data.loc[index, "Tm"] = m
-            self.data.loc[index, "gamma"] = gamma
             
             #Ahrr
             self.data.loc[index, "ahrr"] = 0.0
             
             #Specie
-            for specie in self._cylinder.mixture.mix:
-                self.data.loc[index, specie.specie.name + "_x"] = specie.X
-                self.data.loc[index, specie.specie.name + "_y"] = specie.Y
+            self._storeMixture(index)
     
     ####################################
     def _update(self) -> None:
@@ -895,50 +1228,118 @@ class EngineModel(BaseClass):
         #TODO injection models for mass end energy souce terms
         #TODO heat transfer models for temperature (open systems only!)
         
-        #Current time
-        CA = self.time.time
+        #Local references
+        time = self.time
+        cylinder = self._cylinder
+        precomputed = self._precomputed
+        results = self._results
+        deltaT = time.deltaT
         
-        #Update state
-        p = self.data.p(CA)
-        V = self.geometry.V(CA)
-        dpdCA = (self.data.p(CA) - self.data.p(self.time.oldTime))/self.time.deltaT
-        self._cylinder.update(pressure=p, volume=V)
+        #Current and old time
+        index = self._CAindex[time.time]
+        indexOld = self._CAindex[time.oldTime]
         
-        #Gamma
-        T = self._cylinder.state.T
-        gamma = self._cylinder.mixture.gamma(p,T)
-        m = self._cylinder.state.m
+        #Update state
+        p = precomputed["p"][index]
+        V = precomputed["V"][index]
+        pOld = precomputed["p"][indexOld]
+        dpdCA = precomputed["dpdCA"][index]
+        cylinder.update(pressure=p, volume=V)
+        
+        #Gamma (the state is returned as a copy: access it once)
+        state = cylinder.state
+        mixture = cylinder.mixture
+        T = state.T
+        gamma = mixture.gamma(p,T)
+        m = state.m
         
         #Apparent heat release rate [J/CA]
         #Generalization to allow other EoS
-        TOld = self.data.T(self.time.oldTime)
-        pOld = self.data.p(self.time.oldTime)
-        mOld = self.data.m(self.time.oldTime)
+        TOld = results["T"][indexOld]
+        mOld = results["m"][indexOld]
         #Apporximating Us derivative backwards in time
-        dUsdCA = (self._cylinder.mixture.us(p,T)*m - self._cylinder.mixture.us(pOld,TOld)*mOld)/self.time.deltaT
-        ahrr = dUsdCA + p*self.geometry.dVdCA(CA) #- dmIndCA*mixtureIn.hs(p,T) + dmOutdCA*mixtureOut.hs(p,T)
+        dUsdCA = (mixture.us(p,T)*m - mixture.us(pOld,TOld)*mOld)/deltaT
         
         self._updateMixtures()
         
-        #Store
-        index = self.data.index[self.data['CA'] == CA].tolist()[0]
+        #Store main parameters
+        results["dpdCA"][index] = dpdCA
+        results["V"][index] = V
+        results["T"][index] = T
+        results["m"][index] = m
+        results["gamma"][index] = gamma
+        self._dUsdCA[index] = dUsdCA
         
-        #Main parameters
-        self.data.loc[index, "dpdCA"] = dpdCA
-        self.data.loc[index, "V"] = V
-        self.data.loc[index, "T"] = T
-        self.data.loc[index, "m"] = m
-        self.data.loc[index, "gamma"] = gamma
-        self.data.loc[index, "AHRR"] = ahrr
+        #Mixture composition
+        self._storeMixture(index)
+    
+    ####################################
+    def _addSpecie(self, name:str) -> int:
+        """
+        Add a specie to the buffer of the mixture composition (with zero mole and mass fractions).
+
+        Args:
+            name (str): The name of the specie
+
+        Returns:
+            int: The index of the specie in the buffer
+        """
+        self._species[name] = self._speciesBuffer.shape[1]
+        self._speciesBuffer = np.concatenate([self._speciesBuffer, np.zeros((len(self._speciesBuffer), 1, 2))], axis=1)
+        return self._species[name]
+    
+    ####################################
+    def _storeMixture(self, index:int) -> None:
+        """
+        Store the current composition of the cylinder mixture in the buffer at a given row.
+
+        Args:
+            index (int): The row
+        """
+        mix = self._cylinder.mixture.mix
+        
+        #Columns of the species (the specie set is usually the same at all time-steps)
+        names = tuple(mix.specieNames)
+        cols = self._speciesCols.get(names)
+        if cols is None:
+            for name in names:
+                if not name in self._species:
+                    #Specie not known before the time-loop (products changing with the state)
+                    self._addSpecie(name)
+            cols = self._speciesCols[names] = [self._species[name] for name in names]
+        
+        #Store all the mole and mass fractions at once
+        self._speciesBuffer[index, cols, 0] = mix.X
+        self._speciesBuffer[index, cols, 1] = mix.Y
+    
+    ####################################
+    def _storeResults(self) -> None:
+        """
+        Store the fields computed in the time-loop (self._results) to self.data.
+        """
+        for f, values in self._results.items():
+            self.data[f] = values
         
         #Mixture composition
-        for specie in self._cylinder.mixture.mix:
-            if not (specie.specie.name + "_x") in self.data.columns:
-                self.data[specie.specie.name + "_x"] = 0.0
-                self.data[specie.specie.name + "_y"] = 0.0
-            else:
-                self.data.loc[index, specie.specie.name + "_x"] = specie.X
-                self.data.loc[index, specie.specie.name + "_y"] = specie.Y
+        for name, ii in self._species.items():
+            self.data[name + "_x"] = self._speciesBuffer[:,ii,0]
+            self.data[name + "_y"] = self._speciesBuffer[:,ii,1]
+    
+    ####################################
+    def _computeAHRR(self) -> None:
+        """
+        Compute the apparent heat release rate [J/CA] at the times processed in the 
+        time-loop, from the derivative of the internal energy (vectorized):
+            AHRR = dUs/dCA + p*dV/dCA
+        """
+        #TODO: - dmIndCA*mixtureIn.hs(p,T) + dmOutdCA*mixtureOut.hs(p,T)
+        #Single pass over the arrays, without intermediate copies
+        AHRR = np.multiply(self._precomputed["p"], self._precomputed["dVdCA"])
+        np.add(AHRR, self._dUsdCA, out=AHRR)
+        
+        #Keep the original values at the times not processed in the time-loop
+        np.copyto(AHRR, self.data.array("AHRR"), where=np.isnan(self._dUsdCA))
+        self.data["AHRR"] = AHRR
     
     ####################################
     def _process__post__(self) -> None:
@@ -953,7 +1354,7 @@ class EngineModel(BaseClass):
         """
         #WHF and ROHR
         self._computeWallHeatFlux()
-        self.data["ROHR"] = self.data["AHRR"] + self.data["dQwalls"]
+        self.data["ROHR"] = np.add(self.data.array("AHRR"), self.data.array("dQwalls"))
         
         #Cumulatives
         self.data["cumHR"] = self.cumulativeIntegral("ROHR")
@@ -964,44 +1365,55 @@ class EngineModel(BaseClass):
         """
         Compute wall heat fluxes for each patch and global value in each region. Might be overloaded in child.
         """
-        areas = self.geometry.areas(self.data["CA"])
+        CA = self.data.array("CA")
+        areas = self.geometry.areas(CA)
         
         #Compute wall heat transfer coefficient:
-        h = self.HeatTransferModel.h(engine=self, CA=self.data["CA"])
+        h = self.HeatTransferModel.h(engine=self, CA=CA)
         self.data["heatTransferCoeff"] = h
         
-        #Total whf
+        #Total whf (accumulated on arrays and stored at the end)
         self.data["dQwalls"] = 0.0
         self.data["Qwalls"] = 0.0
         self.data["wallsArea"] = 0.0
+        dQwalls = np.zeros(len(CA))
+        Qwalls = np.zeros(len(CA))
+        wallsArea = np.zeros(len(CA))
         
+        T = self.data.array("T")
         for patch in [c for c in areas.columns if not (c == "CA")]:
             #Search temperature as "T<patchName>":
             if f"T{patch}" in self.data.columns:
-                Twall = self.data[f"T{patch}"]
+                Twall = self.data.array(f"T{patch}")
             #Fallback to default "Twalls": 
             elif "Twalls" in self.data.columns:
-                Twall = self.data["Twalls"]
+                Twall = self.data.array("Twalls")
             else:
                 raise ValueError("Cannot compute wall heat flux. Either load patch temperatures in the form t<patchName> or default temperature Twalls to compute wall heat fluxes.")
 
             #Compute patch area:
-            A = areas[patch]
-            self.data["wallsArea"] += A
+            A = areas[patch].to_numpy()
+            wallsArea += A
             
             name = patch + "Area"
             if not name in self.data.columns:
                 self.data[name] = A
             
             #Compute wall heat flux at patch [converted to J/CA]:
-            self.data[f"dQ{patch}"] = h * A * (self.data["T"] - Twall) / self.time.dCAdt
+            dQ = h * A * (T - Twall) / self.time.dCAdt
+            self.data[f"dQ{patch}"] = dQ
             
             #Compute cumulative
-            self.data[f"Q{patch}"] = self.cumulativeIntegral(f"dQ{patch}")
+            Q = self.cumulativeIntegral(f"dQ{patch}")
+            self.data[f"Q{patch}"] = Q
             
             #Add to total
-            self.data["dQwalls"] += self.data[f"dQ{patch}"]
-            self.data["Qwalls"] += self.data[f"Q{patch}"]
+            dQwalls += dQ
+            Qwalls += Q
+        
+        self.data["dQwalls"] = dQwalls
+        self.data["Qwalls"] = Qwalls
+        self.data["wallsArea"] = wallsArea
             
     ####################################
     def refresh(self, reset:bool=False) -> EngineModel:
@@ -1033,6 +1445,22 @@ class EngineModel(BaseClass):
             
         self.process()
         
+    ####################################
+    def _CArange(self, start:float, end:float) -> slice:
+        """
+        The rows of the processed data in the range of CA [start,end] (the CA 
+        range is sorted, hence found through bisection).
+
+        Args:
+            start (float): Initial CA.
+            end (float): Final CA.
+
+        Returns:
+            slice: The slice of the rows
+        """
+        CA = self.data.array("CA")
+        return slice(np.searchsorted(CA, start, side="left"), np.searchsorted(CA, end, side="right"))
+    
     ####################################
     def integrateVariable(self, y:str, *, x:str="CA", start:float=None, end:float=None) -> float:
         """
@@ -1061,14 +1489,13 @@ class EngineModel(BaseClass):
         self.checkType(start,float,"start")
         self.checkType(end,float,"end")
         
-        index = self.data.index[np.array(self.data["CA"] >= start) & np.array(self.data["CA"] <= end)]
-        data = self.data.iloc[index]
+        rows = self._CArange(start, end)
         
         #Filter out "nan"
-        Yarray = data[y].copy()
+        Yarray = self.data.array(y)[rows].copy()
         Yarray[np.isnan(Yarray)] = 0.0
         
-        return integrate.trapz(Yarray, x=data[x])
+        return integrate.trapz(Yarray, x=self.data.array(x)[rows])
     
     ####################################
     def cumulativeIntegral(self, y:str, *, x:str="CA", start:float=None) -> np.ndarray:
@@ -1089,24 +1516,26 @@ class EngineModel(BaseClass):
         if not y in self.data.columns:
             raise ValueError(f"Variable '{y}' not present among data.")
         
-        from scipy import integrate
+        CA = self.data.array("CA")
         
         #Check for start
         start = self.time.startOfCombustion() if start is None else start
         #Check for motored
-        start = self.data["CA"][0] if start is None else start
+        start = CA[0] if start is None else start
         #Check type
         self.checkType(start,float,"start")
         
         #Filter out "nan"
-        Yarray = self.data[y].copy()
+        Yarray = self.data.array(y).copy()
         Yarray[np.isnan(Yarray)] = 0.0
         
-        #Compute cumulative
-        out = integrate.cumulative_trapezoid(Yarray, x=self.data[x], initial=0.0)
+        #Compute cumulative (trapezoidal rule, zero at first point)
+        out = np.empty_like(Yarray)
+        out[0] = 0.0
+        np.cumsum(np.diff(self.data.array(x)) * (Yarray[1:] + Yarray[:-1]) / 2.0, out=out[1:])
         
         #Set zero at start
-        valAtStart = np.interp(start, self.data["CA"], out)
+        valAtStart = np.interp(start, CA, out)
         out -= valAtStart
         
         return out
@@ -1130,11 +1559,9 @@ class EngineModel(BaseClass):
         self.checkType(start,float,"start")
         self.checkType(end,float,"end")
         
-        index = self.data.index[np.array(self.data["CA"] >= start) & np.array(self.data["CA"] <= end)]
-        data = self.data.iloc[index]
-        data.loc[index,"V"] = self.geometry.V(data["CA"])
+        V = self.geometry.V(self.data.array("CA")[self._CArange(start, end)])
         
-        return self.work(start=start, end=end)/(np.nanmax(data["V"]) - np.nanmin(data["V"]))
+        return self.work(start=start, end=end)/(np.nanmax(V) - np.nanmin(V))
     
     ####################################
     def work(self, start:float=None, end:float=None) -> float:
@@ -1157,14 +1584,14 @@ class EngineModel(BaseClass):
         self.checkType(start,float,"start")
         self.checkType(end,float,"end")
         
-        index = self.data.index[np.array(self.data["CA"] >= start) & np.array(self.data["CA"] <= end)]
-        #Remove nan
-        index = index[np.invert(np.isnan(self.data.loc[index, "p"]))]
+        rows = self._CArange(start, end)
+        p = self.data.array("p")[rows]
+        CA = self.data.array("CA")[rows]
         
-        data = self.data.iloc[index]
-        data.loc[index,"V"] = self.geometry.V(data["CA"])
+        #Remove nan
+        valid = np.invert(np.isnan(p))
         
-        return integrate.trapz(data["p"], x=data["V"])
+        return integrate.trapz(p[valid], x=self.geometry.V(CA[valid]))
     
     ####################################
     def plotPV(self, /,*,start:float=None, end:float=None, loglog:bool=True, timingsParams:dict=dict(), showTimings:bool=True, ax:Axes=None, **kwargs):
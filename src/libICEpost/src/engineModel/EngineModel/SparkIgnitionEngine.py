@@ -15,8 +15,6 @@ Last update:        DD/MM/YYYY
 from .EngineModel import EngineModel
 
 #Other imports
-from operator import attrgetter
-
 from libICEpost.src.base.dataStructures.Dictionary import Dictionary
 
 from ..EngineTime.EngineTime import EngineTime
@@ -156,7 +154,7 @@ class SparkIgnitionEngine(EngineModel):
             #Get data for zone
             zoneDict = zones[zone]
             self.checkType(zoneDict, dict, f"zones[{zone}]")
-            zoneDict = Dictionary(**zoneDict)
+            zoneDict = self._asDictionary(zoneDict)
             
             if not "premixedFuel" in zoneDict:
                 continue
@@ -164,7 +162,7 @@ class SparkIgnitionEngine(EngineModel):
             zoneDict = zoneDict.lookup("premixedFuel")
             
             #This zone:
-            currZone:ThermoModel = attrgetter("_" + zone)(self)
+            currZone:ThermoModel = getattr(self, self._zoneAttr[zone])
             
             #Fuel
             fuel:Mixture = zoneDict.lookup("mixture")
@@ -200,8 +198,7 @@ class SparkIgnitionEngine(EngineModel):
             EngineModel: self
         """
         self.checkType(combustionProperties, dict, "combustionProperties")
-        if not isinstance(combustionProperties, Dictionary):
-            combustionProperties = Dictionary(**combustionProperties)
+        combustionProperties = self._asDictionary(combustionProperties)
         
         #Get fuel
         fuel = combustionProperties.lookup("initialMixture").lookup("cylinder").lookup("premixedFuel").lookup("mixture")
@@ -52,6 +52,22 @@ class Reaction(BaseClass):
     def products(self):
         return self._products
     
+    ################################
+    @property
+    def reactantNames(self) -> frozenset[str]:
+        """
+        The names of the molecules in the reactants
+        """
+        return self._reactantNames
+    
+    ################################
+    @property
+    def productNames(self) -> frozenset[str]:
+        """
+        The names of the molecules in the products
+        """
+        return self._productNames
+    
     #########################################################################
     def __init__(self, reactants, products):
         """
@@ -138,6 +154,10 @@ class Reaction(BaseClass):
             # Store current mixture composition. Used to update the class 
             # data in case the mixutre has changed
             self._reactantsOld = self._reactants.copy()
+        
+        #Names of the specie, for fast look-up
+        self._reactantNames = frozenset(self._reactants.specieNames)
+        self._productNames = frozenset(self._products.specieNames)
     
 #########################################################################
 #Create selection table
@@ -126,21 +126,17 @@ class ReactionModel(BaseClass):
         if not reactants is None:
             self._reactants = reactants
         
-        # Store current mixture composition. Used to update the class 
-        # data in case the mixutre has changed
-        if not hasattr(self,"_reactantsOld"):
-            #First initialization
-            self._reactantsOld = self._reactants.copy()
-            return False
-        else:
-            #Updating
-            if not (self._reactants == self._reactantsOld):
-                #Change detected
-                self._reactantsOld = self._reactants
-                return False
+        # Store the fingerprint of current mixture composition (independent
+        # of the order of the specie). Used to update the class data only
+        # in case the mixutre has changed
+        fingerprint = tuple(sorted(zip(self._reactants.specieNames, self._reactants.X, self._reactants.Y)))
+        if hasattr(self,"_reactantsFingerprint") and (fingerprint == self._reactantsFingerprint):
+            #Already updated (True)
+            return True
         
-        #Already updated (True)
-        return True
+        #First initialization or change detected
+        self._reactantsFingerprint = fingerprint
+        return False
     
 #########################################################################
 #Create selection table
@@ -11,8 +11,8 @@ Last update:        12/06/2023
 #                               IMPORT                              #
 #####################################################################
 
-import math
-import sympy as sym
+import numpy as np
+from collections import OrderedDict
 
 from .ReactionModel import ReactionModel
 from ..Reaction.Reaction import Reaction
@@ -49,6 +49,9 @@ class Stoichiometry(ReactionModel):
     #The type of reation to look-up for
     _ReactionType:str = "StoichiometricReaction"
     
+    #Maximum number of fuel compositions stored in the cache of stoichiometric mixtures
+    _stoichCacheSize:int = 128
+    
     #########################################################################
     @property
     def fuel(self):
@@ -112,6 +115,9 @@ class Stoichiometry(ReactionModel):
         
         self.checkType(oxidizer, Molecule, "oxidizer")
         self._oxidizer = oxidizer
+        self._oxReactions = {}
+        self._fuelsSpecieNames = None
+        self._stoichCache = OrderedDict()
         
         super().__init__(reactants)
         
@@ -125,16 +131,113 @@ class Stoichiometry(ReactionModel):
     #Methods:
     def _updateFuels(self):
         """
-        Update list of fuels
+        Update list of fuels (only if the specie in the reactants changed)
         """
+        names = tuple(self.reactants.specieNames)
+        if names == self._fuelsSpecieNames:
+            return self
+        
         fuels = []
         for s in self.reactants:
             if s.specie.name in database.chemistry.specie.Fuels:
                 fuels.append(s.specie)
         self._fuels = fuels
+        self._fuelsSpecieNames = names
+        
+        return self
+    
+    ###################################
+    def _updateOxidationReactions(self):
+        """
+        Update the look-up table of the oxidation reactions of each fuel (fuel name -> reaction)
+        """
+        oxReactions = {}
+        reactions = self.reactions[self.ReactionType]
+        for r in reactions:
+            react = reactions[r]
+            if self.oxidizer.name in react.reactantNames:
+                for name in react.reactantNames:
+                    #Keep the first reaction found for each fuel
+                    oxReactions.setdefault(name, react)
+        oxReactions.pop(self.oxidizer.name, None)
+        self._oxReactions = oxReactions
         
         return self
         
+    ###################################
+    def _stoichiometricMixtures(self, fuelMix:Mixture, oxReactions:dict[str,Reaction]) -> tuple[Mixture,Mixture]:
+        """
+        Compute the stoichiometric reacting mixture and the stoichiometric products
+        for a given composition of the fuels. The results are cached (LRU) based
+        on the fuel composition.
+
+        Args:
+            fuelMix (Mixture): The sub-mixture of the fuels in the reactants
+            oxReactions (dict[str,Reaction]): The oxidation reaction of each fuel
+
+        Returns:
+            tuple[Mixture,Mixture]: The stoichiometric reacting mixture and a copy of the stoichiometric products
+        """
+        key = tuple((f.name, fuelMix[f].X) for f in self._fuels)
+        if key in self._stoichCache:
+            self._stoichCache.move_to_end(key)
+            stoichReactingMix, prods = self._stoichCache[key]
+            return stoichReactingMix, prods.copy()
+        
+        #Stoichiometric combustion products:
+        #   -> Solving linear sistem of equations 
+        #
+        #   R0: c1*[f00*F0 + o0*Ox   ]          | Oxidation reaction fuel F0 (reactants)
+        #   R1: c2*[f11*F1 + o1*Ox   ]          | Oxidation reaction fuel F1 (reactants)
+        #   R2: c3*[f22*F2 + o2*Ox   ]          | Oxidation reaction fuel F2 (reactants)
+        #   ----------------------------------
+        #   Rtot: f(f1*F1 + f2*F2 + ...) + o*Ox | Overall reactants
+        #
+        #   Where (f1, f2, ...) is the composition of the fuel-only mixture (known)
+        #   and (c1, c2, ..., f) are the unknowns
+        #
+        #   The equations are:
+        #   sum(c_i * f_ii) = f*f_i for i in (1,...,n_fuels)
+        #   sum(c_i) = 1 for i in (1,...,n_fuels)
+        #
+        #   Hence n_fuels+1 unknowns and n_fuel+1 equations
+        #
+        #   |f00  0   0  ... -f0| |c1| |0|
+        #   | 0  f11  0  ... -f1|*|c2|=|0|
+        #   |...                | |..| |.|
+        #   | 1   1   1  ...  0 | |f | |1|
+        #
+        #   [M]*x = v
+        #
+        #   Since [M] is diagonal except for the last row/column, the system
+        #   is solved in closed form (no need to assemble it):
+        #   c_i = f*f_i/f_ii, with f such that sum(c_i) = 1
+        #
+        
+        xStoich = np.array([fuelMix[f].X/oxReactions[f.name].reactants[f.name].X for f in self._fuels])
+        xStoich /= xStoich.sum()
+        
+        stoichReactingMix = mixtureBlend\
+            (
+                [oxReactions[f.name].reactants for f in self._fuels], 
+                [xx for xx in xStoich],
+                "mole"
+            )
+        
+        prods = mixtureBlend\
+            (
+                [oxReactions[f.name].products for f in self._fuels], 
+                [xx for xx in xStoich],
+                "mole"
+            )
+        
+        #Store in cache
+        self._stoichCache[key] = (stoichReactingMix, prods)
+        if len(self._stoichCache) > self._stoichCacheSize:
+            self._stoichCache.popitem(last=False)
+        
+        return stoichReactingMix, prods.copy()
+    
     ###################################
     def _update(self, reactants:Mixture=None, **state) -> bool:
         """
@@ -163,20 +266,19 @@ class Stoichiometry(ReactionModel):
         #Look for the oxidation reactions for all fuels
         oxReactions = {}    #List of oxidation reactions
         for f in self._fuels:
-            found = False
-            for r in self.reactions[self.ReactionType]:
-                react = self.reactions[self.ReactionType][r]
-                if (f in react.reactants) and (self.oxidizer in react.reactants):
-                    found = True
-                    oxReactions[f.name] = react
-                    break
-            if not found:
+            if not f.name in self._oxReactions:
+                #The database might have been extended
+                self._updateOxidationReactions()
+            if f.name in self._oxReactions:
+                oxReactions[f.name] = self._oxReactions[f.name]
+            else:
                 raise ValueError(f"Oxidation reaction not found in database 'rections.{self.ReactionType}' for the couple (fuel, oxidizer) = ({f.name, self.oxidizer.name})")
         
-        #Identification of reacting compounds
-        yReact = 0.0
-        reactingMix = None
-        activeReactions = []
+        #Identification of reacting compounds and inerts (single pass)
+        reactantNames = set(self.reactants.specieNames)
+        fuelNames = {f.name for f in self._fuels}
+        reactingSpecie, yReacting = [], []
+        inertSpecie, yInerts = [], []
         #Loop over specie of the reactants
         for specie in self.reactants:
             #Loop over all oxidation reactions to find the active reactions
@@ -184,18 +286,14 @@ class Stoichiometry(ReactionModel):
             for r in oxReactions:
                 react = oxReactions[r]
                 #Check if the specie in the reactants of the reaction
-                if specie.specie in react.reactants:
+                if specie.specie.name in react.reactantNames:
                     #Check that all reactants of the reaction are found in the mixture,
                     #otherwise the reaction does not take place
-                    active = True
-                    for sR in react.reactants:
-                        if not (sR.specie in self.reactants):
-                            active = False
-                            break
+                    active = react.reactantNames.issubset(reactantNames)
                     
-                    if not self.oxidizer in react.reactants:
+                    if not self.oxidizer.name in react.reactantNames:
                         active = False
-                    if not any([mol in react.reactants for mol in self._fuels]):
+                    if react.reactantNames.isdisjoint(fuelNames):
                         active = False
                     
                     #If not active, skip to next reaction
@@ -204,38 +302,31 @@ class Stoichiometry(ReactionModel):
                     
                     #If here, an active reaction was found
                     found = True
+                    break
                     
-                    #Check if already added to reactions
-                    if not react in activeReactions:
-                        #Add to active reactions
-                        activeReactions.append(react)
-                    
-            #add the specie to the reacting mixture if an active reaction was found
+            #add the specie to the reacting mixture if an active reaction was found, else to inerts
             if found:
-                if reactingMix is None:
-                    reactingMix = Mixture([specie.specie], [1])
-                elif specie.specie in reactingMix:
-                    #skip
-                    continue
-                else:
-                    reactingMix.dilute(specie.specie, specie.Y/(yReact + specie.Y), "mass")
-                yReact += specie.Y
+                reactingSpecie.append(specie.specie)
+                yReacting.append(specie.Y)
+            else:
+                inertSpecie.append(specie.specie)
+                yInerts.append(specie.Y)
         
         #If reacting mixture still empty, products are equal to reactants:
-        if reactingMix is None:
+        if len(reactingSpecie) == 0:
             self._products = self._reactants
             return False    #Updated
         
-        #Removing inerts
+        #Build the reacting mixture and the inerts
+        yReacting = np.array(yReacting)
+        yReact = yReacting.sum()
+        reactingMix = Mixture(reactingSpecie, (yReacting/yReact).tolist(), "mass")
+        
         inerts = None
-        yInert = 0.0
-        for specie in self.reactants:
-            if not specie.specie in reactingMix:
-                if inerts is None:
-                    inerts = Mixture([specie.specie], [1])
-                else:
-                    inerts.dilute(specie.specie, specie.Y/(yInert + specie.Y), "mass")
-                yInert += specie.Y
+        yInerts = np.array(yInerts)
+        yInert = float(yInerts.sum())
+        if yInert > 0.0:
+            inerts = Mixture(inertSpecie, (yInerts/yInert).tolist(), "mass")
         
         # print("Reactants:")
         # print(self.reactants)
@@ -246,67 +337,13 @@ class Stoichiometry(ReactionModel):
         # print(f"Inerts (Y = {yInert})")
         # print(inerts)
         
-        # print("Active reactions:",[str(r) for r in activeReactions])
-        
         #To assess if lean or rich, mix the oxidation reactions based on the
         #fuel mole/mass fractions in the fuels-only mixture. If the concentration
         #of oxidizer is higher then the actual, the mixture is rich, else lean.
         
-        #Get stoichiometric combustion products:
-        #   -> Solving linear sistem of equations 
-        #
-        #   R0: c1*[f00*F0 + o0*Ox   ]          | Oxidation reaction fuel F0 (reactants)
-        #   R1: c2*[f11*F1 + o1*Ox   ]          | Oxidation reaction fuel F1 (reactants)
-        #   R2: c3*[f22*F2 + o2*Ox   ]          | Oxidation reaction fuel F2 (reactants)
-        #   ----------------------------------
-        #   Rtot: f(f1*F1 + f2*F2 + ...) + o*Ox | Overall reactants
-        #
-        #   Where (f1, f2, ...) is the composition of the fuel-only mixture (known)
-        #   and (c1, c2, ..., f) are the unknowns
-        #
-        #   The equations are:
-        #   sum(c_i * f_ii) = f*f_i for i in (1,...,n_fuels)
-        #   sum(c_i) = 1 for i in (1,...,n_fuels)
-        #
-        #   Hence n_fuels+1 unknowns and n_fuel+1 equations
-        #
-        #   |f00  0   0  ... -f0| |c1| |0|
-        #   | 0  f11  0  ... -f1|*|c2|=|0|
-        #   |...                | |..| |.|
-        #   | 1   1   1  ...  0 | |f | |1|
-        #
-        #   [M]*x = v
-        #
-        
+        #Get stoichiometric combustion products (cached based on fuel composition)
         fuelMix = self.fuel
-        
-        M = self.np.diag([oxReactions[f.name].reactants[f.name].X for f in self._fuels])
-        M = self.np.c_[M, [-fuelMix[f].X for f in self._fuels]]
-        M = self.np.c_[M.T, [1.]*(len(fuelMix)) + [0.]].T
-        v = self.np.c_[self.np.zeros((1,len(fuelMix))), [1]].T
-        xStoich = self.np.linalg.solve(M,v).T[0][:-1]
-        
-        # print(xStoich)
-        
-        stoichReactingMix = mixtureBlend\
-            (
-                [oxReactions[f.name].reactants for f in self._fuels], 
-                [xx for xx in xStoich],
-                "mole"
-            )
-        
-        # print("Fuel mixture:")
-        # print(fuelMix)
-        
-        # print("Stoichiometric reacting mixture:")
-        # print(stoichReactingMix)
-        
-        prods = mixtureBlend\
-            (
-                [oxReactions[f.name].products for f in self._fuels], 
-                [xx for xx in xStoich],
-                "mole"
-            )
+        stoichReactingMix, prods = self._stoichiometricMixtures(fuelMix, oxReactions)
         
         # print("Stoichiometric products:")
         # print(prods)
@@ -314,17 +351,21 @@ class Stoichiometry(ReactionModel):
         #If the reaction is not stoichiometric, add the non-reacting part:
         # y_exc_prod = y_exc - y_def*(y_exc_st/y_def_st)
         
-        if not math.isclose(stoichReactingMix[self.oxidizer].Y,reactingMix[self.oxidizer].Y):
-            if (reactingMix[self.oxidizer].Y > stoichReactingMix[self.oxidizer].Y):
+        yOx = reactingMix[self.oxidizer].Y
+        yOx_st = stoichReactingMix[self.oxidizer].Y
+        dyOx = yOx - yOx_st
+        #Same relative tolerance of math.isclose
+        if abs(dyOx) > 1e-9*max(abs(yOx), abs(yOx_st)):
+            if dyOx > 0.0:
                 #Excess oxidizer
-                y_exc = reactingMix[self.oxidizer].Y
-                y_exc_st = stoichReactingMix[self.oxidizer].Y
+                y_exc = yOx
+                y_exc_st = yOx_st
                 excMix = Mixture([self.oxidizer],[1.])
             else:
                 #Excess fuel
-                y_exc = 1. - reactingMix[self.oxidizer].Y
-                y_exc_st = 1. - stoichReactingMix[self.oxidizer].Y
-                excMix = self.fuel
+                y_exc = 1. - yOx
+                y_exc_st = 1. - yOx_st
+                excMix = fuelMix
             #Add non-reacting compound
             
             y_def = 1 - y_exc
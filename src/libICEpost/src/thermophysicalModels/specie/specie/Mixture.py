@@ -22,6 +22,7 @@ from libICEpost.src.base.Utilities import Utilities
 from dataclasses import dataclass
 
 import math
+import numpy as np
 from .Atom import Atom
 from .Molecule import Molecule
 
@@ -81,12 +82,12 @@ class Mixture(Utilities):
         """
         The mass fractions.
         """
-        return [self.np.round(y, Mixture._decimalPlaces) for y in self._Y]
+        return [np.round(y, Mixture._decimalPlaces) for y in self._Y]
     
     #################################
     @Y.setter
     def Y(self, y:list):
-        self.checkTypes(y, [list, self.np.ndarray], "y")
+        self.checkTypes(y, [list, np.ndarray], "y")
         if not len(y) == len(self):
             raise ValueError("Inconsistent size of y with mixture composition.")
         self._Y = list(y[:])
@@ -98,12 +99,12 @@ class Mixture(Utilities):
         """
         The mole fractions.
         """
-        return [self.np.round(x, Mixture._decimalPlaces) for x in self._X]
+        return [np.round(x, Mixture._decimalPlaces) for x in self._X]
     
     #################################
     @X.setter
     def X(self, x:list):
-        self.checkTypes(x, [list, self.np.ndarray], "x")
+        self.checkTypes(x, [list, np.ndarray], "x")
         if not len(x) == len(self):
             raise ValueError("Inconsistent size of x with mixture composition.")
         self._X = list(x[:])
@@ -395,6 +396,9 @@ class Mixture(Utilities):
     ###############################
     def __eq__(self, mix):
         self.checkType(mix, Mixture, "mix")
+        #Same instance (e.g., mixture not changed since last update)
+        if mix is self:
+            return True
         specieList1 = sorted([s for s in self],key=(lambda x: x.specie))
         specieList2 = sorted([s for s in mix],key=(lambda x: x.specie))
 
@@ -720,21 +724,25 @@ def mixtureBlend(mixtures:list[Mixture], composition:list[float], fracType:str="
     except BaseException as err:
         Utilities.fatalErrorInArgumentChecking(None,mixtureBlend, err)
     
-    mixBlend:Mixture = None
+    #Weighted sum of the compositions, in order of appearance of the specie
+    #(same result of successive dilutions, but building the mixture once)
+    specie:dict[str,Molecule] = {}
+    fracts:dict[str,float] = {}
     for ii, mix in enumerate(mixtures):
         if composition[ii] <= 0.:
             continue
         
-        if mixBlend is None:
-            mixBlend = mix.copy()
-            Yblen = composition[ii]
-            continue
-            
-        Ydil = composition[ii]/(Yblen + composition[ii])
-        mixBlend.dilute(mix, Ydil, fracType)
-        Yblen += composition[ii]
+        for item in mix:
+            name = item.specie.name
+            if not name in specie:
+                specie[name] = item.specie
+                fracts[name] = 0.0
+            fracts[name] += composition[ii]*(item.Y if (fracType == "mass") else item.X)
+    
+    fracts = np.array(list(fracts.values()))
+    fracts /= fracts.sum()
     
-    return mixBlend
+    return Mixture(list(specie.values()), fracts.tolist(), fracType)
 
 #############################################################################
 #Load database
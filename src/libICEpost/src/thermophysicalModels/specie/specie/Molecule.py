@@ -11,6 +11,8 @@ Last update:        12/06/2023
 #                               IMPORT                              #
 #####################################################################
 
+import sys
+
 from libICEpost.src.base.Utilities import Utilities
 from dataclasses import dataclass
 
@@ -133,8 +135,8 @@ class Molecule(Utilities):
         except BaseException as err:
             self.fatalErrorInArgumentChecking(self.__init__, err)
         
-        #Initialization:
-        self.name = specieName
+        #Initialization (name is interned, as used as key for many look-ups):
+        self.name = sys.intern(specieName)
         self.atoms = []
         self.numberOfAtoms = []
         
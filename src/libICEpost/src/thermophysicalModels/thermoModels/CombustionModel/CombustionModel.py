@@ -179,11 +179,10 @@ class CombustionModel(BaseClass):
         if not reactants is None:
             self.checkType(reactants, Mixture, "air")
             
-            old = self._freshMixture
-            self._freshMixture = reactants
-            # self._combustionProducts = reactants
-            # self._mixture = reactants
-            if old != self.freshMixture:
+            #Store a copy, so that changes are detected also if the 
+            #reactants are modified in-place and given again
+            if reactants != self._freshMixture:
+                self._freshMixture = reactants.copy()
                 update = True
             
         #Update state variables
@@ -206,17 +206,15 @@ class PremixedCombustion(CombustionModel):
             #Update air
             if not air is None:
                 self.checkType(air, Mixture, "air")
-                old = self._air
-                self._air = air
-                if old != self.air:
+                if air != self._air:
+                    self._air = air.copy()
                     update = True
                     
             #Update fuel
             if not fuel is None:
                 self.checkType(fuel, Mixture, "fuel")
-                old = self._fuel
-                self._fuel = fuel
-                if old != self.fuel:
+                if fuel != self._fuel:
+                    self._fuel = fuel.copy()
                     update = True
             
             #Xb
@@ -225,8 +223,8 @@ class PremixedCombustion(CombustionModel):
                     self._xb = xb
                     update = True
                 
-            #Update the state and air composition
-            update = update or super().update(**kwargs)
+            #Update the state and reactants composition (always, even if already updated)
+            update = super().update(**kwargs) or update
             
             #Update
             if update:
@@ -238,13 +236,13 @@ class PremixedCombustion(CombustionModel):
                 self._alphaSt = computeAlphaSt(self.air, self.fuel)
                 self._phi = self.alphaSt/alpha
                 
-            #Update combustion products
-            self._combustionProducts = self._reactionModel.products
-            
-            #Update current state based on combustion progress variable
-            newMix = self.freshMixture.copy()
-            newMix.dilute(self.combustionProducts, self._xb, "mass")
-            self._mixture = newMix
+                #Update combustion products
+                self._combustionProducts = self._reactionModel.products
+                
+                #Update current state based on combustion progress variable
+                newMix = self.freshMixture.copy()
+                newMix.dilute(self.combustionProducts, self._xb, "mass")
+                self._mixture = newMix
             
             return self
         except BaseException as err:
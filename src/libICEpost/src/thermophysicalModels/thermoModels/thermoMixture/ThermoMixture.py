@@ -224,4 +224,6 @@ class ThermoMixture(Utilities):
         """
         Heat capacity ratio cp/cv [-]
         """
-        return self.cp(p, T)/self.cv(p, T)
\ No newline at end of file
+        #Evaluate cp only once (cv = cp - (cp - cv))
+        cp = self.cp(p, T)
+        return cp/(cp - self.EoS.cpMcv(p, T))
\ No newline at end of file
@@ -34,4 +34,27 @@ testChild.showRuntimeSelectionTable()
 assert isinstance(testBase.selector("testChild", {}), testChild), "selected Child"
 assert isinstance(testBase.selector("testChild", {}), testBase), "Child derived from Base"
 assert testChild.__name__ in testBase.selectionTable(), "child in selectionTable"
-assert testBase.selectionTable()[testChild.__name__] == testChild , "selected right class"
\ No newline at end of file
+assert testBase.selectionTable()[testChild.__name__] == testChild , "selected right class"
+
+#Abstract classes cannot be selected, both through selector and fastSelector
+class testAbstract(testBase):
+    pass
+testBase.addToRuntimeSelectionTable(testAbstract)
+assert testBase.selectionTable().isAbstract("testAbstract"), "abstract class flagged in selectionTable"
+assert not testBase.selectionTable().isAbstract("testChild"), "concrete class not flagged in selectionTable"
+
+try:
+    testBase.selector("testAbstract", {})
+    raise AssertionError("selector: abstract class instantiated")
+except AssertionError:
+    raise
+except BaseException as err:
+    assert "abstract" in str(err), "selector: error for abstract class"
+
+try:
+    testBase.fastSelector()("testAbstract", {})
+    raise AssertionError("fastSelector: abstract class instantiated")
+except TypeError as err:
+    assert "abstract" in str(err), "fastSelector: error for abstract class"
+
+assert isinstance(testBase.fastSelector()("testChild", {}), testChild), "fastSelector: selected Child"
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Testing the update of PremixedCombustion (change detection of the inputs)
+"""
+
+from libICEpost.Database.chemistry.specie.Mixtures import Mixtures
+from libICEpost.Database.chemistry.specie.Molecules import Fuels
+from libICEpost.src.thermophysicalModels.specie.specie.Mixture import Mixture
+from libICEpost.src.thermophysicalModels.thermoModels.CombustionModel.PremixedCombustion import PremixedCombustion
+
+air = Mixtures.dryAir.copy()
+fuel = Mixture([Fuels.IC8H18], [1.0])
+reactants = air.copy()
+reactants.dilute(fuel, 0.05, "mass")
+
+model = PremixedCombustion(air=air, fuel=fuel, reactants=reactants, xb=0.5)
+
+#Reactants modified in-place and given again (twice, the second time the same instance was already given)
+for ii in range(2):
+    before = model.mixture.copy()
+    reactants.dilute(fuel, 0.02, "mass")
+    model.update(reactants=reactants)
+    assert model.mixture != before, f"in-place change of reactants detected ({ii})"
+    assert model.freshMixture == reactants, f"fresh mixture updated ({ii})"
+    assert not (model.freshMixture is reactants), f"reactants stored as copy ({ii})"
+
+#No change
+before = model.mixture.copy()
+model.update(reactants=reactants)
+assert model.mixture == before, "no change"
+
+#Reactants and progress variable updated together
+before = model.mixture.copy()
+reactants.dilute(fuel, 0.02, "mass")
+model.update(0.6, reactants=reactants)
+assert model.freshMixture == reactants, "reactants updated together with xb"
+assert model.mixture != before, "mixture updated with xb and reactants"
+
+print("Combustion model tests: PASSED")
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Testing the cached numpy access (array/col/row) of EngineData and the
+loading methods storing multiple variables (loadDict, loadArrays, assign, readFile)
+"""
+
+import os
+import tempfile
+import numpy as np
+from libICEpost.src.base.dataStructures.EngineData.EngineData import EngineData
+
+CA = np.array([0., 1., 2., 3., 4.])
+p = np.array([1., 2., 3., 4., 5.])
+T = np.array([300., 310., 320., 330., 340.])
+
+def newData() -> EngineData:
+    ed = EngineData()
+    ed.loadDict({"CA":CA, "p":p, "T":T}, verbose=False)
+    return ed
+
+#########################################################################
+#Loading
+ed = newData()
+assert list(ed.columns) == ["CA", "p", "T"], "loadDict: columns (CA first)"
+assert np.array_equal(ed.array("p"), p), "loadDict: values"
+assert ed.array("p") is ed.array("p"), "array: cached"
+assert ed.col("T") is ed.array("T"), "col: same as array"
+assert ed.row(2) == {"CA":2., "p":3., "T":320.}, "row: values"
+
+#loadDict on non-empty table merges by CA
+ed.loadDict({"CA":[1., 3.], "V":[10., 30.]}, verbose=False)
+assert np.array_equal(ed.array("V")[[1,3]], [10., 30.]), "loadDict: merging"
+
+#loadArrays
+ed = newData()
+ed.loadArrays(CA, 2.*p, "p2", verbose=False)
+assert np.array_equal(ed.array("p2"), 2.*p), "loadArrays: values"
+try:
+    ed.loadArrays(CA, p[:-1], "p3", verbose=False)
+    raise AssertionError("loadArrays: inconsistent lengths not detected")
+except AssertionError:
+    raise
+except BaseException:
+    pass
+
+#########################################################################
+#Cache invalidation
+#__setitem__ (existing and new variable)
+ed = newData()
+old = ed.array("p")
+ed["p"] = 2.*p
+assert np.array_equal(ed.array("p"), 2.*p), "cache invalidated by __setitem__"
+ed["V"] = T
+assert np.array_equal(ed.array("V"), T), "new variable through __setitem__"
+
+#loc
+ed = newData()
+ed.array("p")
+ed.loc[1, "p"] = -1.
+assert ed.array("p")[1] == -1., "cache invalidated by loc"
+
+#iloc
+ed = newData()
+ed.array("T")
+ed.iloc[2, 2] = -2.
+assert ed.array("T")[2] == -2., "cache invalidated by iloc"
+
+#__delitem__
+ed = newData()
+ed.array("T")
+del ed["T"]
+assert not "T" in ed.columns, "__delitem__"
+
+#loadArray on existing variable
+ed = newData()
+ed.array("p")
+ed.loadArray(np.array([CA, 3.*p]).T, "p", verbose=False)
+assert np.array_equal(ed.array("p"), 3.*p), "cache invalidated by loadArray"
+
+#loadDict
+ed = newData()
+ed.array("T")
+ed.loadDict({"CA":CA, "T":2.*T}, verbose=False)
+assert np.array_equal(ed.array("T"), 2.*T), "cache invalidated by loadDict"
+
+#########################################################################
+#assign
+ed = newData()
+ed.array("p")
+ed.assign(p=0.0, m=float("nan"), V=T)
+assert list(ed.columns) == ["CA", "p", "T", "m", "V"], "assign: order of columns"
+assert np.all(ed.array("p") == 0.0), "assign: overwrite existing (cache invalidated)"
+assert np.all(np.isnan(ed.array("m"))), "assign: uniform value"
+assert np.array_equal(ed.array("V"), T), "assign: time-series"
+assert ed.V(1.5) == 315., "assign: interpolator created"
+
+#########################################################################
+#readFile
+with tempfile.TemporaryDirectory() as tmp:
+    fileName = os.path.join(tmp, "p.dat")
+    np.savetxt(fileName, np.array([CA, p]).T, header="CA p")
+
+    arr = EngineData.readFile(fileName, "p", CAOff=1.0, varScale=2.0, verbose=False)
+    assert arr.shape == (len(CA), 2), "readFile: shape"
+    assert np.array_equal(arr[:,0], CA + 1.), "readFile: CA offset"
+    assert np.array_equal(arr[:,1], 2.*p), "readFile: variable scaling"
+
+    #loadFile is readFile + loadArray
+    ed = newData()
+    ed.array("p")
+    ed.loadFile(fileName, "p", varScale=2.0, verbose=False)
+    assert np.array_equal(ed.array("p"), 2.*p), "loadFile: cache invalidated"
+
+print("EngineData cache tests: PASSED")
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Testing batch filtering (Filter.batch) against the filters applied by column,
+and the column-wise interpolation Filter._interp against np.interp
+"""
+
+import numpy as np
+from libICEpost.src.base.Filter import Filter, Resample, LowPass, LowPassAndResample, UserDefinedFilter
+
+#Data-sets sampled at the same (slightly irregular) CA points
+rng = np.random.default_rng(1)
+x = np.linspace(-180, 180, 3001)
+x[1::2] += 0.02
+Y = np.column_stack([np.sin(x/10.) + rng.normal(size=len(x))*0.1 for _ in range(4)])
+Y[100,2] = float("nan")
+
+def checkBatch(filter:Filter, x:np.ndarray, Y:np.ndarray) -> None:
+    name = filter.__class__.__name__
+    xBatch, YBatch = filter.batch(x, Y)
+    ref = [filter(x, Y[:,ii]) for ii in range(Y.shape[1])]
+
+    assert YBatch.shape == (len(ref[0][0]), Y.shape[1]), f"{name}: shape of batch output"
+    assert np.array_equal(xBatch, ref[0][0]), f"{name}: x sampling points"
+    for ii in range(Y.shape[1]):
+        assert np.allclose(YBatch[:,ii], ref[ii][1], rtol=1e-12, atol=1e-12, equal_nan=True), f"{name}: column {ii}"
+
+#########################################################################
+#Filters implementing batch
+checkBatch(Resample(0.5), x, Y)
+checkBatch(LowPass(5.0, order=3), x, Y)
+checkBatch(LowPassAndResample(delta=0.5, cutoff=5.0, order=3), x, Y)
+
+#Default implementation (by column)
+checkBatch(UserDefinedFilter(lambda xp, yp: (xp[::2], yp[::2]*2.)), x, Y)
+
+#Default implementation with different x for each data-set: must fail
+counter = {"n":0}
+def shifting(xp, yp):
+    counter["n"] += 1
+    return xp + counter["n"], yp
+try:
+    UserDefinedFilter(shifting).batch(x, Y)
+    raise AssertionError("Filter.batch: different x sampling points not detected")
+except ValueError:
+    pass
+
+#########################################################################
+#Interpolation by columns (nan outside of range, constant intervals, end-points)
+xp = np.array([0., 1., 2., 3., 5.])
+Fp = np.column_stack([[0., 1., 1., 4., 2.], [3., -1., 2., 2., 7.]])
+xi = np.array([-1., 0., 0.3, 1., 1.5, 2.5, 3., 4.99, 5., 6., float("nan")])
+out = Filter._interp(xi, xp, Fp)
+for ii in range(Fp.shape[1]):
+    ref = np.interp(xi, xp, Fp[:,ii], left=float("nan"), right=float("nan"))
+    assert np.array_equal(out[:,ii], ref, equal_nan=True), f"Filter._interp: column {ii}"
+
+print("Filter batch tests: PASSED")
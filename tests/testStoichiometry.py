@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Testing the Stoichiometry reaction model with the cache of stoichiometric
+mixtures (based on the fuel composition)
+"""
+
+from libICEpost.Database.chemistry.specie.Mixtures import Mixtures
+from libICEpost.Database.chemistry.specie.Molecules import Fuels
+from libICEpost.src.thermophysicalModels.specie.specie.Mixture import Mixture, mixtureBlend
+from libICEpost.src.thermophysicalModels.specie.reactions.ReactionModel.Stoichiometry import Stoichiometry
+
+air = Mixtures.dryAir.copy()
+
+def reactants(fuel:Mixture, yFuel:float) -> Mixture:
+    mix = air.copy()
+    mix.dilute(fuel, yFuel, "mass")
+    return mix
+
+fuel1 = Mixture([Fuels.IC8H18], [1.0])
+fuel2 = mixtureBlend([Mixture([Fuels.CH4], [1.0]), Mixture([Fuels.H2], [1.0])], [0.7, 0.3], "mole")
+
+#########################################################################
+#Repeated calls with the same reactants
+model = Stoichiometry(reactants(fuel1, 0.05))
+prods1 = model.products.copy()
+assert len(model._stoichCache) == 1, "stoichiometric mixtures stored in cache"
+
+for yFuel in (0.03, 0.08, 0.05):
+    #Same fuel composition, different equivalence ratio: cache hit
+    model.update(reactants=reactants(fuel1, yFuel))
+    assert len(model._stoichCache) == 1, f"cache hit for same fuel composition (yFuel = {yFuel})"
+    #Same as non-cached computation
+    assert model.products == Stoichiometry(reactants(fuel1, yFuel)).products, f"cached products (yFuel = {yFuel})"
+
+assert model.products == prods1, "repeated call with same reactants"
+
+#The cached products are not modified by the dilution with excess reactants
+model.update(reactants=reactants(fuel1, 0.03))
+model.update(reactants=reactants(fuel1, 0.05))
+assert model.products == prods1, "cache not modified by updates"
+
+#########################################################################
+#Different fuel compositions
+model.update(reactants=reactants(fuel2, 0.04))
+assert len(model._stoichCache) == 2, "new entry for different fuel composition"
+assert model.products == Stoichiometry(reactants(fuel2, 0.04)).products, "products of blended fuel"
+assert model.products != prods1, "different products for different fuels"
+
+#Back to first fuel
+model.update(reactants=reactants(fuel1, 0.05))
+assert model.products == prods1, "products from cache after changing fuel"
+
+#########################################################################
+#LRU eviction
+model = Stoichiometry(reactants(fuel1, 0.05))
+model._stoichCacheSize = 2
+for x in (0.2, 0.4, 0.6):
+    fuel = mixtureBlend([Mixture([Fuels.CH4], [1.0]), Mixture([Fuels.H2], [1.0])], [x, 1. - x], "mole")
+    model.update(reactants=reactants(fuel, 0.04))
+    assert len(model._stoichCache) <= 2, "cache size limited"
+    assert model.products == Stoichiometry(reactants(fuel, 0.04)).products, f"products after eviction (x = {x})"
+
+print("Stoichiometry tests: PASSED")
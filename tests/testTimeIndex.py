@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Testing the look-up of time indexes in the processed data of EngineModel (_timeIndex),
+within the tolerance EngineModel._timeTolerance
+"""
+
+import numpy as np
+from libICEpost.src.base.dataStructures.EngineData.EngineData import EngineData
+from libICEpost.src.engineModel.EngineModel.EngineModel import EngineModel
+
+#Model with only processed data (no construction needed for the look-up)
+model = EngineModel.__new__(EngineModel)
+model._data = EngineData()
+CA = np.array([0., 0.5, 1., 2., 4.])
+model._data.loadDict({"CA":CA, "p":CA*2.}, verbose=False)
+
+tol = model._timeTolerance
+
+def hit(ca:float, index:int) -> None:
+    assert model._timeIndex(ca) == index, f"_timeIndex({ca}) should be {index}"
+
+def miss(ca:float) -> None:
+    try:
+        model._timeIndex(ca)
+        raise AssertionError(f"_timeIndex({ca}) should not be found")
+    except IndexError:
+        pass
+
+#########################################################################
+#Exact times
+for ii, ca in enumerate(CA):
+    hit(ca, ii)
+
+#Within tolerance, on both sides
+hit(1. + 0.5*tol, 2)
+hit(1. - 0.5*tol, 2)
+hit(0.5 - 0.5*tol, 1)
+
+#At the tolerance (exactly representable distance from CA = 0)
+hit(tol, 0)
+hit(-tol, 0)
+
+#Outside of tolerance
+miss(1. + 2.*tol)
+miss(1. - 2.*tol)
+miss(2.*tol)
+miss(0.75)          #Half-way between two times
+
+#Out of the range
+miss(-1.)
+miss(5.)
+hit(4. + 0.5*tol, 4)
+miss(4. + 2.*tol)
+
+#Looking-up with different tolerance (class attribute)
+model._timeTolerance = 0.3
+hit(0.7, 1)         #Closest is 0.5
+hit(0.8, 2)         #Closest is 1.0
+miss(1.5)
+model._timeTolerance = tol
+
+#########################################################################
+#Cached CA range refreshed when the data change size
+model._data.loadDict({"CA":[5.], "p":[10.]}, verbose=False)
+hit(5., 5)
+
+#Empty data
+model._data = EngineData()
+model._dataCA = None
+miss(0.)
+
+print("Time index tests: PASSED")